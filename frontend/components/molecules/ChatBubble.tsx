@@ -23,6 +23,11 @@ export function ChatBubble({ message }: { message: ChatMessageData }) {
             {/* Content */}
             <div className={`flex flex-col gap-2 max-w-[88%] sm:max-w-[75%] md:max-w-[70%] ${isUser ? 'items-end' : 'items-start'}`}>
                 <div className={`rounded-2xl px-4 py-3 text-sm leading-relaxed ${isUser ? 'bg-primary text-primary-foreground rounded-tr-md' : 'bg-card text-card-foreground border border-border rounded-tl-md shadow-sm'}`}>
+                    {message.queue && !message.content && (
+                        <p className="text-xs text-muted-foreground">
+                            ⏳ 요청이 많아 대기 중입니다 ({message.queue.position}번째, 약 {message.queue.eta_seconds}초)
+                        </p>
+                    )}
                     <p className="whitespace-pre-wrap">{message.content}</p>
                     {message.isStreaming && (
                         <motion.span
@@ -2,7 +2,7 @@
 
 import { useState, useCallback, useRef } from 'react'
 import { streamRecommend } from '@/lib/api'
-import type { BookData, SourceData } from '@/types/book'
+import type { BookData, QueueData, SourceData } from '@/types/book'
 import type { ChatMessageData } from '@/types/chat'
 
 export function useStream() {
@@ -52,13 +52,27 @@ export function useStream() {
 
             for await (const chunk of generator) {
                 switch (chunk.type) {
+                    case 'queued':
+                        // LLM 대기열 순번 / 예상 대기 시간 (생성이 시작되면 지움)
+                        updateLastAssistantMsg((msg) => ({ ...msg, queue: chunk.data as QueueData }))
+                        break
+
                     case 'text':
                         updateLastAssistantMsg((msg) => ({
                             ...msg,
+                            queue: undefined,
                             content: msg.content + (chunk.data as string),
                         }))
                         break
 
+                    case 'book':
+                        // 도서 객체가 완성될 때마다 카드 하나씩 추가 (books 이벤트가 최종 목록으로 대체)
+                        updateLastAssistantMsg((msg) => ({
+                            ...msg,
+                            books: [...(msg.books ?? []), chunk.data as BookData],
+                        }))
+                        break
+
                     case 'books':
                         updateLastAssistantMsg((msg) => ({
                             ...msg,
@@ -74,13 +88,14 @@ export function useStream() {
                         break
 
                     case 'done':
-                        updateLastAssistantMsg((msg) => ({ ...msg, isStreaming: false }))
+                        updateLastAssistantMsg((msg) => ({ ...msg, queue: undefined, isStreaming: false }))
                         break
 
                     case 'error':
                         updateLastAssistantMsg((msg) => ({
                             ...msg,
                             content: msg.content + '\n\n⚠️ 오류가 발생했습니다. 잠시 후 다시 시도해주세요.',
+                            queue: undefined,
                             isStreaming: false,
                         }))
                         break
@@ -1,17 +1,17 @@
-import type { BookData, SourceData, StreamChunk } from '@/types/book'
+import type { BookData, BookPage, SourceData, StreamChunk } from '@/types/book'
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL ?? 'http://localhost:80'
 
 // ── Books ─────────────────────────────────────────────────────────────────────
 
 export async function fetchBooks(params?: {
-    skip?: number
+    cursor?: string
     limit?: number
     genre?: string
     store?: string
-}): Promise<BookData[]> {
+}): Promise<BookPage> {
     const query = new URLSearchParams()
-    if (params?.skip) query.set('skip', String(params.skip))
+    if (params?.cursor) query.set('cursor', params.cursor)
     if (params?.limit) query.set('limit', String(params.limit))
     if (params?.genre) query.set('genre', params.genre)
     if (params?.store) query.set('store', params.store)
@@ -27,8 +27,12 @@ export async function fetchBook(id: number): Promise<BookData> {
     return res.json()
 }
 
-export async function searchBooks(q: string): Promise<BookData[]> {
-    const res = await fetch(`${API_URL}/api/books/search?q=${encodeURIComponent(q)}`, {
+export async function searchBooks(
+    q: string,
+    mode: 'contains' | 'prefix' = 'contains',
+): Promise<BookData[]> {
+    const params = new URLSearchParams({ q, mode })
+    const res = await fetch(`${API_URL}/api/books/search?${params}`, {
         cache: 'no-store',
     })
     if (!res.ok) throw new Error(`searchBooks failed: ${res.status}`)
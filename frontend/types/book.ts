@@ -18,18 +18,28 @@ export interface BookData {
   crawled_at?: string
 }
 
+export interface BookPage {
+  items: BookData[]
+  next_cursor: string | null  // pass back as `cursor` for the next page
+}
+
 export interface SourceData {
   store: 'kyobo' | 'millie' | 'aladdin' | string
   category: string
   confidence: number
 }
 
+export interface QueueData {
+  position: number     // 1 = next to run
+  eta_seconds: number
+}
+
 // Streaming chunk types
-export type StreamChunkType = 'text' | 'books' | 'sources' | 'done' | 'error'
+export type StreamChunkType = 'queued' | 'text' | 'book' | 'books' | 'sources' | 'done' | 'error'
 
 export interface StreamChunk {
   type: StreamChunkType
-  data: string | BookData[] | SourceData[] | null
+  data: string | QueueData | BookData | BookData[] | SourceData[] | null
 }
 
 // Crawl
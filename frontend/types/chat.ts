@@ -5,4 +5,5 @@ export interface ChatMessageData {
     books?: import('./book').BookData[]
     sources?: import('./book').SourceData[]
     isStreaming?: boolean
+    queue?: import('./book').QueueData
 }
@@ -0,0 +1,170 @@
+"""
+Gateway Upstream Balancer - 서비스별 다중 인스턴스 부하 분산 + 헬스 기반 라우팅
+- 인스턴스 선택: power-of-two-choices (임의의 두 인스턴스 중 진행 중 요청이 적은 쪽)
+- 능동 헬스 체크: 주기적으로 각 인스턴스의 /api/health 호출, 실패 인스턴스는 복구될 때까지 제외
+- 수동 축출: 연속 실패(연결 오류 / 502·503·504)가 임계값에 도달하면 쿨다운 동안 제외 후 자동 재투입
+- 가용 인스턴스가 하나도 없으면 전체 중에서 선택 (전면 차단보다 시도하는 편이 나음)
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger("gateway")
+
+
+class Instance:
+    """업스트림 인스턴스 하나의 상태."""
+
+    __slots__ = (
+        "url",
+        "outstanding",
+        "healthy",
+        "ejected_until",
+        "failures",
+        "total_requests",
+        "total_failures",
+        "ejections",
+    )
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.failures = 0          # 연속 실패 수
+        self.total_requests = 0
+        self.total_failures = 0
+        self.ejections = 0
+
+    def available(self, now: float) -> bool:
+        return self.healthy and now >= self.ejected_until
+
+    def stats(self, now: float) -> dict:
+        return {
+            "url": self.url,
+            "available": self.available(now),
+            "healthy": self.healthy,
+            "ejected_for_seconds": round(max(0.0, self.ejected_until - now), 1),
+            "outstanding": self.outstanding,
+            "consecutive_failures": self.failures,
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures,
+            "ejections": self.ejections,
+        }
+
+
+class ServiceBalancer:
+    """서비스 하나의 인스턴스 목록과 선택 / 결과 보고 / 헬스 체크."""
+
+    def __init__(
+        self,
+        name: str,
+        urls: list[str],
+        eject_failures: int,
+        eject_seconds: float,
+        health_path: str,
+    ):
+        if not urls:
+            raise ValueError(f"service {name!r}: no upstream instances configured")
+        self.name = name
+        self.instances = [Instance(url) for url in urls]
+        self.eject_failures = max(1, eject_failures)
+        self.eject_seconds = eject_seconds
+        self.health_path = health_path
+        self._rng = random.Random()
+
+    def pick(self, exclude: tuple[Instance, ...] = ()) -> Instance:
+        """가용 인스턴스 중 power-of-two-choices로 선택 (exclude는 가능하면 피함)."""
+        now = time.monotonic()
+        available = [i for i in self.instances if i.available(now)]
+        candidates = (
+            [i for i in available if i not in exclude]
+            or available
+            or [i for i in self.instances if i not in exclude]
+            or self.instances
+        )
+        if len(candidates) == 1:
+            chosen = candidates[0]
+        else:
+            a, b = self._rng.sample(candidates, 2)
+            chosen = a if a.outstanding <= b.outstanding else b
+        chosen.outstanding += 1
+        chosen.total_requests += 1
+        return chosen
+
+    def release(self, instance: Instance, ok: Optional[bool]) -> None:
+        """
+        요청 종료 보고 — 연속 실패가 임계값에 도달하면 쿨다운 동안 축출.
+        ok=None: 결과 없이 중단된 요청 (클라이언트 연결 끊김 등) — 진행 중 수만 반납.
+        """
+        instance.outstanding -= 1
+        if ok is None:
+            return
+        if ok:
+            instance.failures = 0
+            return
+        instance.failures += 1
+        instance.total_failures += 1
+        now = time.monotonic()
+        if instance.failures >= self.eject_failures and now >= instance.ejected_until:
+            instance.ejected_until = now + self.eject_seconds
+            instance.ejections += 1
+            instance.failures = 0
+            logger.warning(
+                f"🚫 [{self.name}] {instance.url} 연속 실패 {self.eject_failures}회 — {self.eject_seconds:g}s 축출"
+            )
+
+    async def _probe(self, client: httpx.AsyncClient, instance: Instance) -> None:
+        try:
+            response = await client.get(f"{instance.url}{self.health_path}")
+            healthy = response.status_code == 200
+        except httpx.HTTPError:
+            healthy = False
+        if healthy != instance.healthy:
+            state = "복구" if healthy else "헬스 체크 실패 — 제외"
+            logger.warning(f"🩺 [{self.name}] {instance.url} {state}")
+        instance.healthy = healthy
+
+    async def check_health(self, client: httpx.AsyncClient) -> None:
+        await asyncio.gather(*(self._probe(client, instance) for instance in self.instances))
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "available": sum(1 for i in self.instances if i.available(now)),
+            "instances": [i.stats(now) for i in self.instances],
+        }
+
+
+class HealthChecker:
+    """모든 서비스 인스턴스에 대한 주기적 능동 헬스 체크."""
+
+    def __init__(self, balancers: list[ServiceBalancer], interval_seconds: float, timeout_seconds: float):
+        self.balancers = balancers
+        self.interval_seconds = interval_seconds
+        self._client = httpx.AsyncClient(timeout=timeout_seconds)
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.gather(*(b.check_health(self._client) for b in self.balancers))
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self._client.aclose()
+
+
+def parse_urls(value: str) -> list[str]:
+    """쉼표 구분 URL 목록."""
+    return [url.strip() for url in value.split(",") if url.strip()]
@@ -0,0 +1,169 @@
+"""
+Gateway Response Cache - 도서 카탈로그 GET 응답 인메모리 캐시
+- (method, path, 정규화된 query) 키 기반
+- TTL + LRU 축출 + 전체 바이트 상한
+- 동일 키 동시 miss는 업스트림 호출 1회로 병합 (single-flight)
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlencode
+
+class CachedResponse:
+    """버퍼링된 업스트림 응답 한 건."""
+
+    __slots__ = ("status_code", "headers", "body", "stored_at", "expires_at")
+
+    def __init__(self, status_code: int, headers: list[tuple[str, str]], body: bytes, ttl: float):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.stored_at = time.monotonic()
+        self.expires_at = self.stored_at + ttl
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+    @property
+    def age(self) -> int:
+        return int(time.monotonic() - self.stored_at)
+
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+class ResponseCache:
+    """TTL + LRU + 바이트 상한을 갖는 응답 캐시 (single-flight 포함)."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+        max_entry_bytes: int,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._bytes = 0
+        # invalidate 시 증가 — 무효화 이전에 시작된 fetch 결과는 저장하지 않음
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(method: str, path: str, query_items: list[tuple[str, str]]) -> str:
+        """쿼리 파라미터 순서에 무관한 캐시 키 생성."""
+        query = urlencode(sorted(query_items))
+        return f"{method.upper()} /{path.strip('/')}?{query}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> bool:
+        size = entry.size
+        if size > self.max_entry_bytes or size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[CachedResponse]],
+        cacheable: Callable[[CachedResponse], bool],
+    ) -> tuple[CachedResponse, str]:
+        """
+        캐시 조회 후 miss 시 fetch 실행.
+        반환: (응답, "HIT" | "MISS" | "COALESCED")
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry, "HIT"
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight), "COALESCED"
+
+        # fetch는 별도 태스크로 실행 — 첫 요청자가 끊겨도 대기 중인 요청은 영향 없음
+        self.misses += 1
+        task = asyncio.create_task(self._fetch_and_store(key, fetch, cacheable))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task), "MISS"
+
+    async def _fetch_and_store(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[CachedResponse]],
+        cacheable: Callable[[CachedResponse], bool],
+    ) -> CachedResponse:
+        generation = self._generation
+        try:
+            entry = await fetch()
+            if generation == self._generation and cacheable(entry):
+                self.set(key, entry)
+            return entry
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """prefix(예: "api/books")로 시작하는 경로의 항목 제거. None이면 전체."""
+        self._generation += 1
+        if prefix is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return removed
+
+        needle = "/" + prefix.strip("/")
+        keys = [k for k in self._entries if k.split(" ", 1)[1].startswith(needle)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "inflight": len(self._inflight),
+        }
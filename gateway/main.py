@@ -1,12 +1,27 @@
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import field_validator
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
+from contextlib import asynccontextmanager
+import asyncio
 import httpx
 import os
 import logging
+from typing import Optional
+
+from balancer import HealthChecker, Instance, ServiceBalancer, parse_urls
+from cache import CachedResponse, ResponseCache
+from metrics import (
+    REQUEST_ID_HEADER,
+    UPSTREAM_ATTEMPTS,
+    MetricsMiddleware,
+    get_request_id,
+    metrics_endpoint,
+)
+from routes import Route, RouteTable, load_route_table
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +32,43 @@ class Settings(BaseSettings):
     BOOK_SERVICE_URL: str = "http://book-service:8001"
     CRAWL_SERVICE_URL: str = "http://crawl-service:8002"
     RECOMMEND_SERVICE_URL: str = "http://recommend-service:8003"
+    # 다중 인스턴스 (쉼표 구분, 지정 시 *_SERVICE_URL 대신 사용)
+    BOOK_SERVICE_URLS: str = ""
+    CRAWL_SERVICE_URLS: str = ""
+    RECOMMEND_SERVICE_URLS: str = ""
+
+    # 인스턴스 헬스 체크 / 수동 축출
+    HEALTH_CHECK_PATH: str = "/api/health"
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0     # 0이면 능동 헬스 체크 끔
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    UPSTREAM_EJECT_FAILURES: int = 3                # 연속 실패 시 축출
+    UPSTREAM_EJECT_SECONDS: float = 30.0            # 축출 후 재투입까지 쿨다운
+
+    # 업스트림 커넥션 풀 설정 (서비스별 최대 연결 수 / keep-alive 유지 수)
+    BOOK_SERVICE_MAX_CONNECTIONS: int = 100
+    BOOK_SERVICE_MAX_KEEPALIVE: int = 20
+    CRAWL_SERVICE_MAX_CONNECTIONS: int = 10
+    CRAWL_SERVICE_MAX_KEEPALIVE: int = 2
+    RECOMMEND_SERVICE_MAX_CONNECTIONS: int = 50
+    RECOMMEND_SERVICE_MAX_KEEPALIVE: int = 10
+    UPSTREAM_KEEPALIVE_EXPIRY: float = 30.0
+    UPSTREAM_HTTP2: bool = False   # h2 패키지 필요 (httpx[http2])
+
+    # 라우트 테이블 (GATEWAY_ROUTES_FILE: JSON 배열 — 지정 시 기본 테이블 대체)
+    GATEWAY_ROUTES_FILE: str = ""
+    BOOK_ROUTE_TIMEOUT_SECONDS: float = 10.0        # 카탈로그 조회 (buffered, 멱등 재시도)
+    UPSTREAM_TIMEOUT_SECONDS: float = 300.0         # 추천 스트리밍 (청크 간 대기 상한)
+    CRAWL_ROUTE_TIMEOUT_SECONDS: float = 120.0      # 크롤링 작업 API (trigger 즉시 반환, 진행 이벤트 스트리밍)
+    UPSTREAM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    UPSTREAM_RETRY_BACKOFF_SECONDS: float = 0.05    # 재시도 간격 (시도마다 2배)
+
+    # 도서 카탈로그 GET 응답 캐시 (크롤링 완료 시 crawl-service가 무효화)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: float = 600.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 2 * 1024 * 1024
+    CACHE_INVALIDATE_TOKEN: str = ""
     
     # CORS 설정
     BACKEND_CORS_ORIGINS: list[str] = ["*"]
@@ -37,7 +89,181 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-app = FastAPI(title="BookCurator Gateway")
+
+def service_urls() -> dict[str, list[str]]:
+    return {
+        "book": parse_urls(settings.BOOK_SERVICE_URLS) or [settings.BOOK_SERVICE_URL],
+        "crawl": parse_urls(settings.CRAWL_SERVICE_URLS) or [settings.CRAWL_SERVICE_URL],
+        "recommend": parse_urls(settings.RECOMMEND_SERVICE_URLS) or [settings.RECOMMEND_SERVICE_URL],
+    }
+
+
+def build_balancers() -> dict[str, ServiceBalancer]:
+    return {
+        name: ServiceBalancer(
+            name,
+            urls,
+            eject_failures=settings.UPSTREAM_EJECT_FAILURES,
+            eject_seconds=settings.UPSTREAM_EJECT_SECONDS,
+            health_path=settings.HEALTH_CHECK_PATH,
+        )
+        for name, urls in service_urls().items()
+    }
+
+
+def default_routes() -> list[dict]:
+    """기본 라우트 테이블 — 카탈로그는 짧게, 추천은 길게 스트리밍, 크롤링은 별도 풀에서 작업 API로."""
+    return [
+        {
+            "name": "books",
+            "prefix": "/api/books",
+            "service": "book",
+            "timeout": settings.BOOK_ROUTE_TIMEOUT_SECONDS,
+            "retries": 2,
+            "mode": "buffered",
+            "cache": True,
+            "max_connections": settings.BOOK_SERVICE_MAX_CONNECTIONS,
+            "max_keepalive": settings.BOOK_SERVICE_MAX_KEEPALIVE,
+        },
+        {
+            "name": "health",
+            "prefix": "/api/health",
+            "service": "book",
+            "timeout": 5.0,
+            "retries": 1,
+            "mode": "buffered",
+            "max_connections": 10,
+            "max_keepalive": 2,
+        },
+        {
+            "name": "recommend",
+            "prefix": "/api/recommend",
+            "service": "recommend",
+            "timeout": settings.UPSTREAM_TIMEOUT_SECONDS,
+            "retries": 1,   # POST는 재시도하지 않음 (GET 상태 조회만)
+            "mode": "stream",
+            "max_connections": settings.RECOMMEND_SERVICE_MAX_CONNECTIONS,
+            "max_keepalive": settings.RECOMMEND_SERVICE_MAX_KEEPALIVE,
+        },
+        {
+            "name": "crawl",
+            "prefix": "/api/crawl",
+            "service": "crawl",
+            "timeout": settings.CRAWL_ROUTE_TIMEOUT_SECONDS,
+            "retries": 0,
+            "mode": "stream",   # /jobs/{id}/events NDJSON
+            "max_connections": settings.CRAWL_SERVICE_MAX_CONNECTIONS,
+            "max_keepalive": settings.CRAWL_SERVICE_MAX_KEEPALIVE,
+        },
+    ]
+
+
+class UpstreamPool:
+    """라우트 하나에 대한 장수명 httpx 클라이언트 + 사용량 집계 (인스턴스 선택은 balancer)."""
+
+    def __init__(
+        self,
+        name: str,
+        balancer: ServiceBalancer,
+        max_connections: int,
+        max_keepalive: int,
+        timeout: httpx.Timeout,
+    ):
+        self.name = name
+        self.balancer = balancer
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY,
+            ),
+            http2=settings.UPSTREAM_HTTP2,
+            timeout=timeout,
+        )
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+
+    def acquire(self) -> None:
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        """
+        풀 점유 현황 (풀 사이징용).
+        httpx 내부 풀 상태(비공개 API) 대신 acquire/release로 직접 센 값만 사용 —
+        peak_in_flight가 max_connections에 닿으면 요청이 커넥션 대기 중이라는 뜻 (HTTP/1.1 기준).
+        """
+        return {
+            "service": self.balancer.name,
+            "http2": settings.UPSTREAM_HTTP2,
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "utilization": round(self.in_flight / self.max_connections, 3) if self.max_connections else None,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "total_requests": self.total_requests,
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def build_upstream_pools(routes: RouteTable, balancers: dict[str, ServiceBalancer]) -> dict[str, UpstreamPool]:
+    """라우트별 전용 풀 — 느린 라우트가 다른 라우트의 연결을 점유하지 않음."""
+    pools = {}
+    for route in routes:
+        if route.service not in balancers:
+            raise ValueError(f"route {route.name!r}: unknown service {route.service!r}")
+        pools[route.name] = UpstreamPool(
+            route.name,
+            balancers[route.service],
+            route.max_connections,
+            route.max_keepalive,
+            httpx.Timeout(route.timeout, connect=route.connect_timeout),
+        )
+    return pools
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.routes = load_route_table(default_routes(), settings.GATEWAY_ROUTES_FILE or None)
+    app.state.balancers = build_balancers()
+    app.state.upstreams = build_upstream_pools(app.state.routes, app.state.balancers)
+    app.state.health_checker = HealthChecker(
+        list(app.state.balancers.values()),
+        interval_seconds=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+        timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    )
+    app.state.health_checker.start()
+    app.state.cache = ResponseCache(
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    )
+    logger.info(
+        "🚀 Gateway Starting — routes: %s",
+        ", ".join(f"{r.prefix}→{r.service}({r.mode}, {r.timeout:g}s)" for r in app.state.routes),
+    )
+    logger.info(
+        "⚖️ Upstream instances: %s",
+        ", ".join(f"{name}×{len(b.instances)}" for name, b in app.state.balancers.items()),
+    )
+    yield
+    await app.state.health_checker.stop()
+    for pool in app.state.upstreams.values():
+        await pool.aclose()
+    logger.info("🛑 Gateway Shutting Down")
+
+
+app = FastAPI(title="BookCurator Gateway", lifespan=lifespan)
 
 #── CORS 설정 (시스템의 유일한 CORS 권위자) ──────────────────
 app.add_middleware(
@@ -46,49 +272,339 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Cache"],
 )
+app.add_middleware(MetricsMiddleware, service="gateway")
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 @app.get("/health")
 async def health():
     return {"status": "ok", "service": "gateway-fastapi"}
 
-def get_target_url(path: str):
-    """경로에 따라 대상 서비스 URL을 결정합니다."""
-    if path.startswith("api/books"):
-        return f"{settings.BOOK_SERVICE_URL}/{path}"
-    elif path.startswith("api/crawl"):
-        return f"{settings.CRAWL_SERVICE_URL}/{path}"
-    elif path.startswith("api/recommend"):
-        return f"{settings.RECOMMEND_SERVICE_URL}/{path}"
-    # 기본값
-    return f"{settings.BOOK_SERVICE_URL}/{path}"
+@app.get("/gateway/pools")
+async def pool_stats(request: Request):
+    """업스트림 커넥션 풀 점유 현황."""
+    return {name: pool.stats() for name, pool in request.app.state.upstreams.items()}
+
+@app.get("/gateway/upstreams")
+async def upstream_stats(request: Request):
+    """서비스별 인스턴스 상태 (가용 여부 / 진행 중 요청 / 실패 / 축출)."""
+    return {name: balancer.stats() for name, balancer in request.app.state.balancers.items()}
+
+@app.get("/gateway/routes")
+async def route_table(request: Request):
+    """컴파일된 라우트 테이블과 라우트별 정책."""
+    return [route.as_dict() for route in request.app.state.routes]
+
+@app.get("/gateway/cache")
+async def cache_stats(request: Request):
+    """응답 캐시 적중률 / 사용량."""
+    return request.app.state.cache.stats()
+
+@app.post("/gateway/cache/invalidate")
+async def invalidate_cache(
+    request: Request,
+    prefix: str | None = None,
+    x_cache_token: str | None = Header(default=None),
+):
+    """응답 캐시 무효화 (crawl-service가 크롤링 커밋 후 호출)."""
+    if settings.CACHE_INVALIDATE_TOKEN and x_cache_token != settings.CACHE_INVALIDATE_TOKEN:
+        raise HTTPException(status_code=403, detail="invalid cache token")
+    removed = request.app.state.cache.invalidate(prefix)
+    logger.info(f"🧹 응답 캐시 무효화 prefix={prefix!r} — {removed}건 제거")
+    return {"removed": removed}
+
+# RFC 7230 hop-by-hop 헤더 — 프록시 구간마다 끊어야 하므로 전달하지 않음
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+# 업스트림 응답에서 버리는 헤더 — 게이트웨이가 직접 설정 (X-Request-ID는 MetricsMiddleware가 추가,
+# 캐시된 응답에 원래 요청의 ID가 남지 않도록 저장 시에도 제거)
+UPSTREAM_RESPONSE_DROP_HEADERS = frozenset({"server", "date", REQUEST_ID_HEADER})
+
+
+def filter_headers(headers: httpx.Headers | dict, extra_drop: set[str] = frozenset()) -> list[tuple[str, str]]:
+    """hop-by-hop 헤더(및 Connection 헤더에 명시된 헤더)를 제거한 목록 반환."""
+    items = headers.multi_items() if isinstance(headers, httpx.Headers) else list(headers.items())
+    drop = HOP_BY_HOP_HEADERS | extra_drop
+    for key, value in items:
+        if key.lower() == "connection":
+            drop = drop | {v.strip().lower() for v in value.split(",")}
+    return [(k, v) for k, v in items if k.lower() not in drop]
+
+
+def forward_headers(request: Request, extra_drop: set[str] = frozenset()) -> list[tuple[str, str]]:
+    """업스트림에 보낼 요청 헤더 (X-Forwarded-For에 클라이언트 IP 추가)."""
+    headers = filter_headers(request.headers, {"host", "x-forwarded-for", REQUEST_ID_HEADER} | extra_drop)
+    request_id = get_request_id()
+    if request_id:
+        headers.append((REQUEST_ID_HEADER, request_id))
+    if request.client:
+        forwarded = request.headers.get("x-forwarded-for")
+        client_ip = request.client.host
+        headers.append(("x-forwarded-for", f"{forwarded}, {client_ip}" if forwarded else client_ip))
+    return headers
+
+
+def request_has_body(request: Request) -> bool:
+    return "content-length" in request.headers or "transfer-encoding" in request.headers
+
+
+def is_cacheable_request(request: Request, route: Route) -> bool:
+    """캐시 라우트(크롤링 주기로만 바뀌는 도서 카탈로그)의 GET만 캐시."""
+    if not settings.RESPONSE_CACHE_ENABLED or not route.cache or request.method != "GET":
+        return False
+    if "authorization" in request.headers:
+        return False
+    cache_control = request.headers.get("cache-control", "").lower()
+    return "no-cache" not in cache_control and "no-store" not in cache_control
+
+
+def is_cacheable_response(entry: CachedResponse) -> bool:
+    if entry.status_code != 200:
+        return False
+    for key, value in entry.headers:
+        if key.lower() == "cache-control" and ("no-store" in value or "private" in value):
+            return False
+    return True
+
+
+# 멱등 요청에 한해 재시도하는 업스트림 상태코드
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+def finish_attempt(route: Route, upstream: UpstreamPool, instance: Instance, failed: Optional[bool]) -> None:
+    """인스턴스 반납 + 업스트림 시도 결과 집계 (failed=None: 취소 등으로 결과 없이 중단)."""
+    upstream.balancer.release(instance, ok=None if failed is None else not failed)
+    outcome = "cancelled" if failed is None else "error" if failed else "ok"
+    UPSTREAM_ATTEMPTS.labels(route.name, instance.url, outcome).inc()
+
+
+def upstream_target(request: Request, path: str) -> str:
+    """인스턴스 base URL 뒤에 붙일 경로 + 쿼리."""
+    target = f"/{path}"
+    if request.query_params:
+        target += f"?{request.query_params}"
+    return target
+
+
+async def send_upstream(
+    request: Request,
+    route: Route,
+    upstream: UpstreamPool,
+    target: str,
+    headers: list[tuple[str, str]],
+    content,
+) -> tuple[httpx.Response, Instance]:
+    """
+    라우트 재시도 정책에 따라 업스트림 요청 (본문은 stream=True로 읽지 않은 채 반환).
+    재시도 시 가능하면 다른 인스턴스 선택. 반환된 인스턴스는 호출자가 finish_attempt로 반납.
+    """
+    balancer = upstream.balancer
+    retries = route.retries_for(request.method)
+    attempt = 0
+    tried: tuple[Instance, ...] = ()
+    while True:
+        instance = balancer.pick(exclude=tried)
+        upstream_request = upstream.client.build_request(
+            method=request.method,
+            url=instance.url + target,
+            content=content,
+            headers=headers,
+        )
+        try:
+            response = await upstream.client.send(upstream_request, stream=True)
+        except httpx.RequestError as e:
+            finish_attempt(route, upstream, instance, failed=True)
+            if attempt >= retries:
+                raise
+            logger.warning(f"[{route.name}] {instance.url} 요청 실패, 재시도 {attempt + 1}/{retries}: {e!r}")
+        except BaseException:
+            # 클라이언트 연결 끊김(CancelledError) 등 — 인스턴스를 바쁜 상태로 남기지 않음
+            finish_attempt(route, upstream, instance, failed=None)
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= retries:
+                return response, instance
+            try:
+                await response.aclose()
+            finally:
+                finish_attempt(route, upstream, instance, failed=True)
+            logger.warning(f"[{route.name}] {instance.url} {response.status_code}, 재시도 {attempt + 1}/{retries}")
+        tried += (instance,)
+        attempt += 1
+        await asyncio.sleep(settings.UPSTREAM_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+
+def upstream_error_response(route: Route, error: Exception) -> JSONResponse:
+    if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)):
+        logger.error(
+            f"[{route.name}] 업스트림 응답 시간 초과 ({route.timeout:g}s) request_id={get_request_id()}: {error!r}"
+        )
+        return JSONResponse(
+            status_code=504,
+            content={"detail": f"{route.service} 서비스 응답 시간이 초과되었습니다."},
+        )
+    logger.error(f"[{route.name}] 업스트림 요청 실패 request_id={get_request_id()}: {error!r}")
+    return JSONResponse(
+        status_code=502,
+        content={"detail": f"{route.service} 서비스에 연결할 수 없습니다."},
+    )
+
+
+async def proxy_cached(request: Request, path: str, route: Route, upstream: UpstreamPool) -> Response:
+    """캐시 경유 프록시 — miss 시 업스트림 응답 전체를 버퍼링해 저장."""
+    cache: ResponseCache = request.app.state.cache
+    key = cache.make_key(request.method, path, request.query_params.multi_items())
+    # 캐시된 본문은 모든 클라이언트에 재사용되므로 압축 없이 받아둠
+    headers = forward_headers(request, {"accept-encoding"})
+    headers.append(("accept-encoding", "identity"))
+
+    async def fetch() -> CachedResponse:
+        upstream.acquire()
+        try:
+            response, instance = await send_upstream(
+                request, route, upstream, upstream_target(request, path), headers, None
+            )
+            failed = response.status_code in RETRYABLE_STATUS_CODES
+            try:
+                body = await response.aread()
+            except httpx.RequestError:
+                failed = True
+                raise
+            finally:
+                try:
+                    await response.aclose()
+                finally:
+                    finish_attempt(route, upstream, instance, failed)
+        finally:
+            upstream.release()
+        return CachedResponse(
+            status_code=response.status_code,
+            headers=filter_headers(response.headers, UPSTREAM_RESPONSE_DROP_HEADERS | {"content-length"}),
+            body=body,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+
+    try:
+        entry, state = await cache.get_or_fetch(key, fetch, is_cacheable_response)
+    except httpx.RequestError as e:
+        return upstream_error_response(route, e)
+
+    cached = Response(content=entry.body, status_code=entry.status_code)
+    for k, v in entry.headers:
+        cached.headers.append(k, v)
+    cached.headers["X-Cache"] = state
+    if state == "HIT":
+        cached.headers["Age"] = str(entry.age)
+    return cached
+
 
 @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
 async def proxy(request: Request, path: str):
-    """요청 경로에 맞춰 적절한 서비스로 프록시합니다."""
-    url = get_target_url(path)
-    
-    # 쿼리 파라미터 포함
-    if request.query_params:
-        url += f"?{request.query_params}"
-
-    # 요청 바디 읽기
-    body = await request.body()
-    headers = dict(request.headers)
-    headers.pop("host", None)
-
-    async def stream_backend():
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            async with client.stream(
-                method=request.method,
-                url=url,
-                content=body,
-                headers=headers
-            ) as response:
-                async for chunk in response.aiter_bytes():
+    """라우트 테이블에서 경로에 맞는 라우트를 찾아 그 정책대로 프록시합니다."""
+    route = request.app.state.routes.match(path)
+    if route is None:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    upstream: UpstreamPool = request.app.state.upstreams[route.name]
+
+    if is_cacheable_request(request, route):
+        return await proxy_cached(request, path, route, upstream)
+
+    # 요청 바디는 버퍼링 없이 청크 단위로 그대로 업스트림에 전달
+    # (재시도 가능한 요청만 재전송을 위해 버퍼링)
+    headers = forward_headers(request)
+    content = None
+    if request_has_body(request):
+        content = await request.body() if route.retries_for(request.method) else request.stream()
+
+    # acquire부터 반납까지 모든 경로(취소 포함)에서 release — 스트리밍은 스트림을 닫는 쪽에 넘김
+    upstream.acquire()
+    handed_off = False
+    try:
+        try:
+            response, instance = await send_upstream(
+                request, route, upstream, upstream_target(request, path), headers, content
+            )
+        except httpx.RequestError as e:
+            return upstream_error_response(route, e)
+
+        if route.mode == "buffered":
+            # 응답 전체를 라우트 타임아웃 안에 받아 한 번에 전달
+            async def read_raw() -> bytes:
+                return b"".join([chunk async for chunk in response.aiter_raw()])
+
+            failed = response.status_code in RETRYABLE_STATUS_CODES
+            try:
+                body = await asyncio.wait_for(read_raw(), timeout=route.timeout)
+            except (httpx.RequestError, asyncio.TimeoutError) as e:
+                failed = True
+                return upstream_error_response(route, e)
+            except BaseException:
+                failed = None
+                raise
+            finally:
+                try:
+                    await response.aclose()
+                finally:
+                    finish_attempt(route, upstream, instance, failed)
+
+            buffered = Response(content=body, status_code=response.status_code)
+            for key, value in filter_headers(response.headers, UPSTREAM_RESPONSE_DROP_HEADERS | {"content-length"}):
+                buffered.headers.append(key, value)
+            return buffered
+
+        # 업스트림 오류만 인스턴스 실패로 보고 (클라이언트가 끊은 경우는 결과 없음으로 반납)
+        failed = response.status_code in RETRYABLE_STATUS_CODES
+        completed = False
+        closed = False
+
+        async def close_upstream() -> None:
+            # 스트림 종료 / 응답 background 양쪽에서 호출 — 한 번만 반납
+            nonlocal closed
+            if closed:
+                return
+            closed = True
+            try:
+                await response.aclose()
+            finally:
+                finish_attempt(route, upstream, instance, failed if completed or failed else None)
+                upstream.release()
+
+        async def stream_backend():
+            nonlocal failed, completed
+            try:
+                # 인코딩된 원본 바이트 그대로 전달 (content-encoding / content-length 유지)
+                async for chunk in response.aiter_raw():
                     yield chunk
+                completed = True
+            except httpx.RequestError:
+                failed = True
+                raise
+            finally:
+                await close_upstream()
 
-    return StreamingResponse(
-        stream_backend(),
-        media_type="application/x-ndjson" if "recommend" in path else "application/json"
-    )
+        # 업스트림 상태코드 / 헤더 그대로 전달 (server, date, x-request-id는 게이트웨이가 직접 설정)
+        # 본문을 한 번도 읽지 못하고 끝나도(연결 끊김) background가 업스트림을 닫고 반납
+        proxied = StreamingResponse(
+            stream_backend(),
+            status_code=response.status_code,
+            background=BackgroundTask(close_upstream),
+        )
+        handed_off = True
+        for key, value in filter_headers(response.headers, UPSTREAM_RESPONSE_DROP_HEADERS):
+            proxied.headers.append(key, value)
+        return proxied
+    finally:
+        if not handed_off:
+            upstream.release()
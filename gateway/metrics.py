@@ -0,0 +1,138 @@
+"""
+Gateway Metrics - Prometheus 형식 요청 / 업스트림 지표 + 요청 ID 전파
+- 서비스(app/core/metrics.py)와 같은 지표 이름 사용 (service="gateway") → 게이트웨이 / 서비스 시간을 나란히 비교
+- 프록시 요청은 라우트 테이블의 라우트 이름(books, recommend ...)을 라벨로 사용
+- 업스트림 시도 결과를 라우트 / 인스턴스 / 결과별로 집계 (오류율 = error / 전체)
+- X-Request-ID: 들어온 값을 그대로 쓰거나 새로 발급해 업스트림 요청과 응답 헤더에 설정
+"""
+import contextvars
+import time
+import uuid
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# 카탈로그 조회(ms)부터 LLM 스트리밍 / 크롤링(분)까지
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "처리한 HTTP 요청 수",
+    ["service", "method", "route", "status"],
+)
+TTFB = Histogram(
+    "http_request_ttfb_seconds",
+    "요청 수신부터 응답 본문 첫 바이트까지",
+    ["service", "method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DURATION = Histogram(
+    "http_request_duration_seconds",
+    "요청 수신부터 응답 본문 마지막 바이트까지",
+    ["service", "method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "처리 중인 HTTP 요청 수",
+    ["service"],
+)
+RESPONSE_BYTES = Counter(
+    "http_response_bytes_total",
+    "응답 본문 바이트 수",
+    ["service", "route"],
+)
+UPSTREAM_ATTEMPTS = Counter(
+    "gateway_upstream_requests_total",
+    "업스트림 요청 시도 수 (재시도 포함)",
+    ["route", "instance", "outcome"],
+)
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """현재 요청의 X-Request-ID (요청 밖이면 None)."""
+    return _request_id.get()
+
+
+def route_template(scope) -> str:
+    """프록시 경로는 라우트 테이블 이름, 게이트웨이 자체 엔드포인트는 경로 템플릿 — 라벨 수 고정."""
+    app = scope.get("app")
+    routes = getattr(getattr(app, "state", None), "routes", None)
+    if routes is not None:
+        matched = routes.match(scope["path"])
+        if matched is not None:
+            return matched.name
+    for route in getattr(app, "routes", ()):
+        if getattr(route, "path", None) == "/{path:path}":
+            continue
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """요청 하나의 시작 / 첫 바이트 / 종료 시각을 기록하는 ASGI 미들웨어."""
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        started = time.perf_counter()
+        status = 500
+        first_byte: Optional[float] = None
+        sent_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, first_byte, sent_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.encode(), request_id.encode("latin-1"))
+                ]
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if first_byte is None and (body or not message.get("more_body", False)):
+                    first_byte = time.perf_counter()
+                sent_bytes += len(body)
+            await send(message)
+
+        IN_FLIGHT.labels(self.service).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.labels(self.service).dec()
+            _request_id.reset(token)
+            finished = time.perf_counter()
+            route = route_template(scope)
+            method = scope["method"]
+            REQUESTS.labels(self.service, method, route, str(status)).inc()
+            TTFB.labels(self.service, method, route).observe((first_byte or finished) - started)
+            DURATION.labels(self.service, method, route).observe(finished - started)
+            RESPONSE_BYTES.labels(self.service, route).inc(sent_bytes)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus 스크레이프 엔드포인트."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,127 @@
+"""
+Gateway Route Table - 선언적 라우트 테이블 + 경로 세그먼트 prefix trie
+- 라우트마다 대상 서비스 / 타임아웃 / 재시도 / 커넥션 풀 크기 / 전달 방식(stream | buffered) / 캐시 여부 지정
+- 기동 시 기본 테이블(코드) 또는 GATEWAY_ROUTES_FILE(JSON 배열)을 읽어 trie로 컴파일
+- 매칭은 세그먼트 단위 최장 prefix ("/api/books"는 "/api/bookstore"와 매칭되지 않음)
+- 어떤 라우트에도 맞지 않는 경로는 None → 게이트웨이가 404
+"""
+import json
+from typing import Iterator, Optional
+
+# 재시도해도 안전한 메서드 (RFC 9110 idempotent)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+ROUTE_MODES = ("stream", "buffered")
+
+
+class Route:
+    """라우트 하나의 업스트림 정책."""
+
+    __slots__ = (
+        "name",
+        "prefix",
+        "service",
+        "timeout",
+        "connect_timeout",
+        "retries",
+        "mode",
+        "cache",
+        "max_connections",
+        "max_keepalive",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        prefix: str,
+        service: str,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        retries: int = 0,
+        mode: str = "stream",
+        cache: bool = False,
+        max_connections: int = 20,
+        max_keepalive: int = 5,
+    ):
+        if mode not in ROUTE_MODES:
+            raise ValueError(f"route {name!r}: mode must be one of {ROUTE_MODES}, got {mode!r}")
+        self.name = name
+        self.prefix = "/" + prefix.strip("/")
+        self.service = service
+        self.timeout = float(timeout)
+        self.connect_timeout = float(connect_timeout)
+        self.retries = max(0, int(retries))
+        self.mode = mode
+        self.cache = bool(cache)
+        self.max_connections = int(max_connections)
+        self.max_keepalive = int(max_keepalive)
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Route":
+        return cls(**raw)
+
+    def retries_for(self, method: str) -> int:
+        """비멱등 요청(POST 등)은 업스트림에 중복 실행될 수 있으므로 재시도하지 않음."""
+        return self.retries if method.upper() in IDEMPOTENT_METHODS else 0
+
+    def as_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def _segments(path: str) -> list[str]:
+    return [segment for segment in path.split("?", 1)[0].strip("/").split("/") if segment]
+
+
+class _Node:
+    __slots__ = ("children", "route")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.route: Optional[Route] = None
+
+
+class RouteTable:
+    """prefix trie로 컴파일된 라우트 테이블."""
+
+    def __init__(self, routes: list[Route]):
+        self._root = _Node()
+        self._routes: list[Route] = []
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: Route) -> None:
+        node = self._root
+        for segment in _segments(route.prefix):
+            node = node.children.setdefault(segment, _Node())
+        if node.route is not None:
+            raise ValueError(f"duplicate route prefix {route.prefix!r} ({node.route.name}, {route.name})")
+        node.route = route
+        self._routes.append(route)
+
+    def match(self, path: str) -> Optional[Route]:
+        """경로 세그먼트를 따라 내려가며 가장 긴 prefix 라우트 반환."""
+        node = self._root
+        matched = node.route
+        for segment in _segments(path):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.route is not None:
+                matched = node.route
+        return matched
+
+    def __iter__(self) -> Iterator[Route]:
+        return iter(self._routes)
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+
+def load_route_table(defaults: list[dict], path: Optional[str] = None) -> RouteTable:
+    """path(JSON 배열)가 있으면 그 테이블을, 없으면 기본 테이블을 컴파일."""
+    raw_routes = defaults
+    if path:
+        with open(path, encoding="utf-8") as f:
+            raw_routes = json.load(f)
+        if not isinstance(raw_routes, list):
+            raise ValueError(f"{path}: route table must be a JSON array")
+    return RouteTable([Route.from_dict(raw) for raw in raw_routes])
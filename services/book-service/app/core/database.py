@@ -2,12 +2,14 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 
+# SQLite(로컬 / 인프로세스 trigram 인덱스 경로)는 QueuePool 인자를 받지 않으므로 서버 DB에만 적용
+_pool_kwargs = {} if settings.POSTGRES_URL.startswith("sqlite") else {"pool_size": 10, "max_overflow": 20}
+
 engine = create_async_engine(
     settings.POSTGRES_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    **_pool_kwargs,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -50,7 +52,10 @@ async def init_db():
         try:
             async with engine.begin() as conn:
                 from app.models import book  # noqa: F401 - registers models
+                from app.core.migrations import lock_schema, run_migrations
+                await lock_schema(conn)
                 await conn.run_sync(Base.metadata.create_all)
+                await run_migrations(conn)
             logger.info("✅ Database initialized successfully.")
             return
         except Exception as e:
@@ -1,12 +1,19 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Float, Integer, DateTime, Text, ForeignKey, func
+from sqlalchemy import JSON, String, Float, Integer, DateTime, Text, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        # 크롤링 upsert(ON CONFLICT) 기준 키
+        UniqueConstraint("title", "author", name="uq_books_title_author"),
+        # 장르·저자 필터 (app/core/migrations.py와 이름/컬럼 일치)
+        Index("ix_books_genre", "genre"),
+        Index("ix_books_author", "author"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(300), nullable=False, index=True)
@@ -19,6 +26,8 @@ class Book(Base):
     publisher: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     published_date: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # 검색용 정규화 키 (app/core/search_key.py) — trigram GIN 인덱스는 마이그레이션 0004에서 생성
+    search_key: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
@@ -36,8 +45,20 @@ class Book(Base):
         return f"<Book id={self.id} title={self.title!r}>"
 
 
+# 목록 keyset 페이지네이션 (crawled_at DESC NULLS LAST, id DESC) — 컬럼 정의 이후에 선언
+# SQLite는 인덱스에 NULLS LAST를 쓸 수 없지만 NULL을 최솟값으로 정렬하므로 DESC만으로 동일
+Index("ix_books_crawled_at_id", Book.crawled_at.desc().nulls_last(), Book.id.desc()).ddl_if(dialect="postgresql")
+Index("ix_books_crawled_at_id", Book.crawled_at.desc(), Book.id.desc()).ddl_if(dialect="sqlite")
+
+
 class BookRanking(Base):
     __tablename__ = "book_rankings"
+    __table_args__ = (
+        Index("ix_book_rankings_book_id", "book_id"),
+        Index("ix_book_rankings_store_book_id", "store", "book_id"),
+        Index("ix_book_rankings_rank", "rank"),
+        Index("ix_book_rankings_store_rank_date", "store", "rank_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     book_id: Mapped[int] = mapped_column(Integer, ForeignKey("books.id"), nullable=False)
@@ -52,6 +73,27 @@ class BookRanking(Base):
         return f"<BookRanking store={self.store} rank={self.rank}>"
 
 
+class CurrentBestseller(Base):
+    """서점별 최신 랭킹 스냅샷 — run_crawl 종료 시 해당 서점분을 같은 트랜잭션에서 재구성."""
+    __tablename__ = "current_bestsellers"
+    __table_args__ = (
+        Index("ix_current_bestsellers_store_rank", "store", "rank"),
+        Index("ix_current_bestsellers_book_id", "book_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    book_id: Mapped[int] = mapped_column(Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False)
+    store: Mapped[str] = mapped_column(String(50), nullable=False)
+    category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    rank_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    book: Mapped["Book"] = relationship("Book")
+
+    def __repr__(self) -> str:
+        return f"<CurrentBestseller store={self.store} rank={self.rank}>"
+
+
 class CrawlLog(Base):
     __tablename__ = "crawl_logs"
 
@@ -62,3 +104,4 @@ class CrawlLog(Base):
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     started_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    phase_timings: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)   # 단계별 소요 시간 (ms)
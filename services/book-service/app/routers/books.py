@@ -1,35 +1,42 @@
-from typing import Optional
+from typing import Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.schemas.book import BookOut
+from app.schemas.book import BookOut, BookPage
 from app.services import book_service
 
 router = APIRouter(prefix="/api/books", tags=["books"])
 
 
-@router.get("", response_model=list[BookOut])
+@router.get("", response_model=BookPage)
 async def list_books(
-    skip: int = Query(default=0, ge=0),
+    skip: int = Query(default=0, ge=0, description="커서 없는 기존 호출 호환용 (cursor 사용 권장)"),
     limit: int = Query(default=50, ge=1, le=200),
     genre: Optional[str] = Query(default=None),
     store: Optional[str] = Query(default=None),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor"),
     db: AsyncSession = Depends(get_db),
 ):
-    """도서 목록 조회 (필터링, 페이지네이션)."""
-    books = await book_service.get_books(db, skip=skip, limit=limit, genre=genre, store=store)
-    return books
+    """도서 목록 조회 (필터링, 커서 페이지네이션)."""
+    try:
+        books, next_cursor = await book_service.get_books(
+            db, skip=skip, limit=limit, genre=genre, store=store, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BookPage(items=books, next_cursor=next_cursor)
 
 
 @router.get("/search", response_model=list[BookOut])
 async def search_books(
     q: str = Query(..., min_length=1, description="검색 키워드 (제목/저자)"),
     limit: int = Query(default=20, ge=1, le=100),
+    mode: Literal["contains", "prefix"] = Query(default="contains", description="contains: 부분/유사 일치, prefix: 자동완성"),
     db: AsyncSession = Depends(get_db),
 ):
     """도서 키워드 검색."""
-    books = await book_service.search_books(db, query=q, limit=limit)
+    books = await book_service.search_books(db, query=q, limit=limit, mode=mode)
     return books
 
 
@@ -34,6 +34,11 @@ class BookOut(BaseModel):
         from_attributes = True
 
 
+class BookPage(BaseModel):
+    items: list[BookOut]
+    next_cursor: Optional[str] = None   # 다음 페이지 요청 시 cursor 파라미터로 전달 (마지막 페이지면 None)
+
+
 class BookCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=300)
     author: str = Field(..., min_length=1, max_length=200)
@@ -1,7 +1,9 @@
-from app.services.book_service import get_books, get_book_by_id, get_bestseller_context, search_books
+from app.services.book_service import get_books, get_book_by_id, decode_cursor, encode_cursor, get_bestseller_context, search_books
 
 __all__ = [
     "get_books",
+    "encode_cursor",
+    "decode_cursor",
     "get_book_id",
     "get_bestseller_context",
     "search_books",
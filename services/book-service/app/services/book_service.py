@@ -2,37 +2,96 @@
 Book Service - 도서 비즈니스 로직
 DB 조회, 필터링, 베스트셀러 컨텍스트 생성
 """
+import base64
+import binascii
+import json
 import logging
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.book import Book, BookRanking
+from app.core.search_key import KEY_SEPARATOR, normalize_search_text
+from app.models.book import Book, CurrentBestseller
+from app.services.search_index import search_index
 
 logger = logging.getLogger(__name__)
 
 
+def encode_cursor(book: Book) -> str:
+    """목록 마지막 도서의 (crawled_at, id)를 불투명 커서 문자열로 인코딩."""
+    crawled_at = book.crawled_at.isoformat() if book.crawled_at else None
+    raw = json.dumps([crawled_at, book.id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    """encode_cursor의 역변환. 형식이 잘못된 경우 ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        crawled_at, book_id = json.loads(raw)
+        return (datetime.fromisoformat(crawled_at) if crawled_at else None), int(book_id)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError("잘못된 커서입니다.") from e
+
+
 async def get_books(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 50,
     genre: Optional[str] = None,
     store: Optional[str] = None,
-) -> list[Book]:
-    """도서 목록 조회 (필터링, 페이지네이션)."""
+    cursor: Optional[str] = None,
+) -> tuple[list[Book], Optional[str]]:
+    """
+    도서 목록 조회 (필터링, keyset 페이지네이션).
+    정렬은 (crawled_at DESC NULLS LAST, id DESC) — ix_books_crawled_at_id 인덱스와 동일.
+    반환: (도서 목록, 다음 페이지 커서 | None). skip은 커서 없는 기존 호출 호환용.
+    """
     query = select(Book).options(selectinload(Book.rankings))
 
     if genre:
         query = query.where(Book.genre.ilike(f"%{genre}%"))
 
     if store:
-        query = query.join(Book.rankings).where(BookRanking.store == store)
+        # 현재 해당 서점 베스트셀러에 있는 도서 (스냅샷 기준, join 대신 EXISTS로 중복 방지)
+        query = query.where(
+            select(CurrentBestseller.id)
+            .where(CurrentBestseller.book_id == Book.id, CurrentBestseller.store == store)
+            .exists()
+        )
 
-    query = query.order_by(desc(Book.crawled_at)).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().unique().all())
+    # limit + 1개를 읽어 다음 페이지 존재 여부 판단
+    size = limit + 1
+    nulls_page = query.where(Book.crawled_at.is_(None)).order_by(desc(Book.id))
+
+    if cursor is None:
+        result = await db.execute(
+            query.order_by(Book.crawled_at.desc().nulls_last(), desc(Book.id)).offset(skip).limit(size)
+        )
+        books = list(result.scalars().all())
+    else:
+        crawled_at, book_id = decode_cursor(cursor)
+        books = []
+        if crawled_at is not None:
+            # row 비교 한 번으로 인덱스 범위 스캔 (NULL 행은 비교에서 제외되어 아래에서 이어 붙임)
+            result = await db.execute(
+                query.where(tuple_(Book.crawled_at, Book.id) < tuple_(crawled_at, book_id))
+                .order_by(desc(Book.crawled_at), desc(Book.id))
+                .limit(size)
+            )
+            books = list(result.scalars().all())
+            if len(books) < size:
+                result = await db.execute(nulls_page.limit(size - len(books)))
+                books += result.scalars().all()
+        else:
+            result = await db.execute(nulls_page.where(Book.id < book_id).limit(size))
+            books = list(result.scalars().all())
+
+    next_cursor = encode_cursor(books[limit - 1]) if len(books) > limit else None
+    return books[:limit], next_cursor
 
 
 async def get_book_by_id(db: AsyncSession, book_id: int) -> Optional[Book]:
@@ -48,43 +107,75 @@ async def get_book_by_id(db: AsyncSession, book_id: int) -> Optional[Book]:
 async def get_bestseller_context(db: AsyncSession, limit: int = 30) -> str:
     """
     LLM 프롬프트용 베스트셀러 컨텍스트 문자열 생성.
-    각 서점 상위 도서를 정형화된 텍스트로 반환.
+    current_bestsellers 스냅샷(서점별 최신 랭킹)만 읽어 최고 순위가 높은 도서부터 정렬.
     """
-    # 최신 랭킹 기준 상위 도서
     result = await db.execute(
-        select(Book)
-        .options(selectinload(Book.rankings))
-        .join(Book.rankings)
-        .order_by(BookRanking.rank)
-        .limit(limit)
+        select(CurrentBestseller, Book)
+        .join(Book, Book.id == CurrentBestseller.book_id)
+        .order_by(CurrentBestseller.rank, CurrentBestseller.store)
     )
-    books = list(result.scalars().unique().all())
+
+    books: dict[int, Book] = {}
+    store_ranks: dict[int, list[str]] = {}
+    for entry, book in result.all():
+        books.setdefault(book.id, book)
+        store_ranks.setdefault(book.id, []).append(f"{entry.store} {entry.rank}위")
 
     if not books:
         return "현재 베스트셀러 데이터가 없습니다. (크롤링 필요)"
 
     lines = []
-    for book in books:
-        store_ranks = ", ".join(
-            f"{r.store} {r.rank}위" for r in book.rankings
-        )
+    for book in list(books.values())[:limit]:
         desc = book.description[:60] + "..." if book.description and len(book.description) > 60 else (book.description or "")
         lines.append(
             f"- [{book.genre or '종합'}] {book.title} / {book.author} "
-            f"| 평점: {book.rating or 'N/A'} | {store_ranks} | {desc}"
+            f"| 평점: {book.rating or 'N/A'} | {', '.join(store_ranks[book.id])} | {desc}"
         )
 
     return "\n".join(lines)
 
 
-async def search_books(db: AsyncSession, query: str, limit: int = 20) -> list[Book]:
-    """제목/저자 키워드 검색."""
+async def search_books(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    mode: str = "contains",
+) -> list[Book]:
+    """
+    제목/저자 키워드 검색 (정규화 키 기반, 점수순).
+    - contains: 부분 일치 + trigram 유사도(오타 허용)
+    - prefix: 제목/저자 접두 일치 (자동완성)
+    PostgreSQL은 pg_trgm GIN 인덱스, 그 외 DB는 인프로세스 trigram 인덱스 사용.
+    """
+    key = normalize_search_text(query)
+    if not key:
+        return []
+
+    if db.get_bind().dialect.name != "postgresql":
+        await search_index.refresh(db)
+        ids = search_index.search(key, mode, limit)
+        if not ids:
+            return []
+        result = await db.execute(
+            select(Book).options(selectinload(Book.rankings)).where(Book.id.in_(ids))
+        )
+        by_id = {book.id: book for book in result.scalars().unique().all()}
+        return [by_id[book_id] for book_id in ids if book_id in by_id]
+
+    # 패턴은 상수로 전달해야 GIN 인덱스 사용 (key는 영숫자/자모만 포함 — LIKE 이스케이프 불필요)
+    if mode == "prefix":
+        title_prefix = Book.search_key.like(f"{key}%")
+        condition = title_prefix | Book.search_key.like(f"%{KEY_SEPARATOR}{key}%")
+        ordering = [title_prefix.desc(), func.length(Book.search_key), Book.id]
+    else:
+        condition = Book.search_key.like(f"%{key}%") | Book.search_key.op("%>")(key)
+        ordering = [func.word_similarity(key, Book.search_key).desc(), func.length(Book.search_key), Book.id]
+
     result = await db.execute(
         select(Book)
         .options(selectinload(Book.rankings))
-        .where(
-            Book.title.ilike(f"%{query}%") | Book.author.ilike(f"%{query}%")
-        )
+        .where(condition)
+        .order_by(*ordering)
         .limit(limit)
     )
     return list(result.scalars().unique().all())
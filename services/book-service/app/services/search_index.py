@@ -0,0 +1,92 @@
+"""
+Search Index - PostgreSQL이 아닌 DB(SQLite 테스트 등)용 인프로세스 trigram 인덱스
+- books.search_key를 trigram → id 역색인으로 보관
+- 도서 수 / 최종 갱신 시각이 바뀌면 다음 검색 때 재구성
+- 점수는 pg_trgm word_similarity와 같은 방식 (검색어 trigram 중 일치 비율)
+"""
+import asyncio
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.search_key import KEY_SEPARATOR
+from app.models.book import Book
+
+# pg_trgm.word_similarity_threshold 기본값과 동일 — 오타/부분 불일치 허용 기준
+SIMILARITY_THRESHOLD = 0.6
+
+
+def trigrams(text: str) -> set[str]:
+    """pg_trgm과 같이 앞 2칸 / 뒤 1칸 공백을 붙여 trigram 생성."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """search_key 역색인. contains/prefix 두 가지 모드로 (id, 점수) 목록을 반환."""
+
+    def __init__(self):
+        self._keys: dict[int, str] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._version: Optional[tuple] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """books 변경이 감지되면 역색인 재구성."""
+        version = tuple((await db.execute(
+            select(func.count(Book.id), func.max(Book.id), func.max(Book.updated_at))
+        )).one())
+        if version == self._version:
+            return
+        async with self._lock:
+            if version == self._version:
+                return
+            rows = (await db.execute(select(Book.id, Book.search_key))).all()
+            keys: dict[int, str] = {}
+            postings: dict[str, set[int]] = {}
+            for book_id, key in rows:
+                if not key:
+                    continue
+                keys[book_id] = key
+                for gram in trigrams(key):
+                    postings.setdefault(gram, set()).add(book_id)
+            self._keys, self._postings, self._version = keys, postings, version
+
+    def _match_counts(self, normalized: str, query_grams: set[str]) -> dict[int, int]:
+        """id별 일치 trigram 수. 3자 미만 검색어는 trigram이 부족하므로 전체 키를 부분 문자열로 확인."""
+        counts: dict[int, int] = {}
+        for gram in query_grams:
+            for book_id in self._postings.get(gram, ()):
+                counts[book_id] = counts.get(book_id, 0) + 1
+        if len(normalized) < 3:
+            for book_id, key in self._keys.items():
+                if normalized in key:
+                    counts.setdefault(book_id, 0)
+        return counts
+
+    def search(self, normalized: str, mode: str, limit: int) -> list[int]:
+        """정규화된 검색어로 id 목록을 점수순으로 반환."""
+        if not normalized:
+            return []
+        query_grams = trigrams(normalized)
+        scored = []
+        for book_id, hits in self._match_counts(normalized, query_grams).items():
+            key = self._keys[book_id]
+            title_key, _, author_key = key.partition(KEY_SEPARATOR)
+            if mode == "prefix":
+                if not (title_key.startswith(normalized) or author_key.startswith(normalized)):
+                    continue
+                # 제목 접두 우선, 짧은(더 정확한) 키 우선
+                score = (title_key.startswith(normalized), -len(key))
+            else:
+                similarity = hits / len(query_grams)
+                if normalized not in key and similarity < SIMILARITY_THRESHOLD:
+                    continue
+                score = (similarity, -len(key))
+            scored.append((score, book_id))
+        scored.sort(key=lambda item: (item[0], -item[1]), reverse=True)
+        return [book_id for _, book_id in scored[:limit]]
+
+
+search_index = TrigramIndex()
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from app.routers import health_router, books_router
 from app.core.database import init_db
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
 from contextlib import asynccontextmanager
 import logging
 
@@ -15,6 +16,8 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Book Service Shutting Down")
 
 app = FastAPI(title="Book Service", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, service="book-service")
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 app.include_router(health_router)
 app.include_router(books_router)
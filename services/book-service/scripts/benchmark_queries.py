@@ -0,0 +1,201 @@
+"""
+Query Benchmark - 카탈로그/랭킹 조회 경로의 인덱스 전후 지연 시간 비교
+- 도서 수만 권 + 수개월치 주간 랭킹을 시드한 뒤 엔드포인트별 서비스 함수를 반복 실행
+- 모델에 선언된 조회용 인덱스를 제거한 상태(before)와 생성한 상태(after)의 p50/p95 를 출력
+
+실행 (book-service 디렉터리에서, 운영 DB가 아닌 별도 DB 사용):
+    python -m scripts.benchmark_queries --database-url postgresql+asyncpg://bookapp:pw@localhost:5432/bench
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+STORES = ("kyobo", "aladdin", "millie")
+GENRES = ("소설", "자기계발", "경제/경영", "역사/문화", "과학", "에세이", "시/에세이", "아동", "청소년", "종합")
+WORDS = ("사랑", "시간", "여름", "바다", "마음", "도시", "기억", "우리", "세계", "나무", "불편한", "편의점", "역행자", "달러")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="book-service 조회 쿼리 벤치마크")
+    parser.add_argument("--database-url", required=True, help="벤치마크 전용 DB URL (데이터가 시드됨)")
+    parser.add_argument("--books", type=int, default=30_000, help="시드할 도서 수")
+    parser.add_argument("--weeks", type=int, default=26, help="시드할 주간 랭킹 기간")
+    parser.add_argument("--ranks", type=int, default=200, help="주/서점당 랭킹 행 수")
+    parser.add_argument("--runs", type=int, default=30, help="케이스별 반복 횟수")
+    parser.add_argument("--reset", action="store_true", help="기존 테이블을 지우고 다시 시드")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+async def seed(args: argparse.Namespace) -> None:
+    from sqlalchemy import func, insert, select
+
+    from app.core.database import AsyncSessionLocal, Base, engine, init_db
+    from app.core.search_key import book_search_key
+    from app.models.book import Book, BookRanking, CurrentBestseller
+
+    if args.reset:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+
+    async with AsyncSessionLocal() as db:
+        existing = (await db.execute(select(func.count(Book.id)))).scalar_one()
+        if existing:
+            print(f"기존 데이터 사용: books={existing}")
+            return
+
+        rng = random.Random(args.seed)
+        now = datetime.utcnow()
+        started = time.perf_counter()
+
+        batch = []
+        for i in range(args.books):
+            title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+            author = f"작가{rng.randrange(args.books // 5 or 1)}"
+            batch.append({
+                "title": title,
+                "author": author,
+                # 크롤러 upsert와 같은 검색 키 — 없으면 search 케이스가 아무것도 매칭하지 않음
+                "search_key": book_search_key(title, author),
+                "genre": rng.choice(GENRES),
+                "rating": round(rng.uniform(6, 10), 1),
+                "crawled_at": now - timedelta(minutes=rng.randrange(60 * 24 * 7 * args.weeks)),
+            })
+            if len(batch) >= 5_000:
+                await db.execute(insert(Book), batch)
+                batch.clear()
+        if batch:
+            await db.execute(insert(Book), batch)
+
+        book_ids = list((await db.execute(select(Book.id))).scalars().all())
+        rows = []
+        current = []   # 가장 최근 주 랭킹 = current_bestsellers 스냅샷
+        for week in range(args.weeks):
+            rank_date = now - timedelta(weeks=week)
+            for store in STORES:
+                for rank, book_id in enumerate(rng.sample(book_ids, min(args.ranks, len(book_ids))), start=1):
+                    rows.append({
+                        "book_id": book_id,
+                        "store": store,
+                        "category": "베스트셀러",
+                        "rank": rank,
+                        "rank_date": rank_date,
+                    })
+                    if week == 0:
+                        current.append(rows[-1])
+                if len(rows) >= 5_000:
+                    await db.execute(insert(BookRanking), rows)
+                    rows.clear()
+        if rows:
+            await db.execute(insert(BookRanking), rows)
+        await db.execute(insert(CurrentBestseller), current)
+        await db.commit()
+
+        print(
+            f"시드 완료: books={len(book_ids)} rankings={args.weeks * len(STORES) * args.ranks} "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+
+def benchmark_cases(book_ids: list[int], deep_cursor: str, rng: random.Random) -> dict:
+    from app.services import book_service
+
+    return {
+        "GET /api/books": lambda db: book_service.get_books(db, limit=50),
+        "GET /api/books?skip=1000": lambda db: book_service.get_books(db, skip=1000, limit=50),
+        "GET /api/books?cursor=(1000th)": lambda db: book_service.get_books(db, cursor=deep_cursor, limit=50),
+        "GET /api/books?genre=소설": lambda db: book_service.get_books(db, genre="소설"),
+        "GET /api/books?store=kyobo": lambda db: book_service.get_books(db, store="kyobo"),
+        "GET /api/books/{id}": lambda db: book_service.get_book_by_id(db, rng.choice(book_ids)),
+        "GET /api/books/search?q=사랑": lambda db: book_service.search_books(db, "사랑"),
+        "bestseller context": lambda db: book_service.get_bestseller_context(db),
+    }
+
+
+async def measure(runs: int, rng: random.Random) -> dict[str, tuple[float, float]]:
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.book import Book
+    from app.services import book_service
+
+    async with AsyncSessionLocal() as db:
+        book_ids = list((await db.execute(select(Book.id))).scalars().all())
+        _, deep_cursor = await book_service.get_books(db, skip=950, limit=50)
+
+    results = {}
+    for name, case in benchmark_cases(book_ids, deep_cursor, rng).items():
+        samples = []
+        for i in range(runs + 1):
+            async with AsyncSessionLocal() as db:
+                started = time.perf_counter()
+                await case(db)
+                elapsed = (time.perf_counter() - started) * 1000
+            if i:   # 첫 실행은 캐시 워밍업으로 제외
+                samples.append(elapsed)
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        results[name] = (statistics.median(samples), p95)
+    return results
+
+
+def _query_indexes():
+    """모델에 선언된 조회용 인덱스 (unique 제약 / 컬럼 index=True 기본 인덱스 제외)."""
+    from app.models.book import Book, BookRanking
+
+    for table in (Book.__table__, BookRanking.__table__):
+        for index in table.indexes:
+            columns = list(index.columns)
+            if index.unique or (len(columns) == 1 and columns[0].index):
+                continue
+            yield index
+
+
+async def set_indexes(enabled: bool) -> None:
+    from sqlalchemy import text
+
+    from app.core.database import engine
+
+    def apply(conn) -> None:
+        for index in _query_indexes():
+            if enabled:
+                index.create(conn, checkfirst=True)
+            else:
+                index.drop(conn, checkfirst=True)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(apply)
+        await conn.execute(text("ANALYZE books"))
+        await conn.execute(text("ANALYZE book_rankings"))
+
+
+async def main() -> None:
+    args = parse_args()
+    os.environ["POSTGRES_URL"] = args.database_url
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app.core.database import engine
+
+    await seed(args)
+
+    await set_indexes(False)
+    before = await measure(args.runs, random.Random(args.seed))
+    await set_indexes(True)
+    after = await measure(args.runs, random.Random(args.seed))
+    await engine.dispose()
+
+    print(f"\n{'query':<32} {'before p50':>11} {'p95':>9} {'after p50':>11} {'p95':>9} {'speedup':>8}")
+    for name, (b50, b95) in before.items():
+        a50, a95 = after[name]
+        speedup = b50 / a50 if a50 else float("inf")
+        print(f"{name:<32} {b50:>9.2f}ms {b95:>7.2f}ms {a50:>9.2f}ms {a95:>7.2f}ms {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
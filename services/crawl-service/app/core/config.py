@@ -26,9 +26,38 @@ class Settings(BaseSettings):
     GOOGLE_MODEL_NAME: str = "gemini-2.0-flash"
 
     # Crawling
-    CRAWL_DELAY_SECONDS: float = 2.0
+    # 페이지 준비 대기 (고정 sleep 대신 조건 폴링, 각 값은 hard deadline)
+    CRAWL_READY_TIMEOUT_SECONDS: float = 20.0
+    CRAWL_IMAGE_TIMEOUT_SECONDS: float = 5.0
+    CRAWL_POLL_INTERVAL_SECONDS: float = 0.1
+    CRAWL_NETWORK_IDLE_MS: int = 500
+
+    # 목록 추출 방식: bulk (execute_script 1회) | element (항목별 find_element)
+    CRAWL_EXTRACTION_MODE: str = "bulk"
+
+    # 서점별 수집 방식: browser (headless Chrome) | http (HTML 파서, 결과 없으면 browser 폴백)
+    CRAWL_STORE_FETCHERS: dict[str, str] = {"aladdin": "http"}
     CRAWL_INTERVAL_HOURS: int = 6
 
+    # 브라우저 워커 풀 (워커마다 debugging 포트 = BASE + index)
+    CRAWL_BROWSER_WORKERS: int = 3
+    CRAWL_DEBUG_PORT_BASE: int = 9222
+    CRAWL_PROFILE_ROOT: str = "/tmp/crawl-chrome"
+
+    # Warm 드라이버 풀 (N = CRAWL_BROWSER_WORKERS)
+    CRAWL_DRIVER_MAX_PAGES: int = 50
+    CRAWL_DRIVER_MAX_MEMORY_GROWTH_MB: float = 300.0
+    CRAWL_DRIVER_PREWARM: bool = False
+
+    # 크롤링 작업 (trigger는 job id만 반환, GET /api/crawl/jobs/{id}로 조회)
+    CRAWL_JOB_HISTORY: int = 100                  # 보관할 작업 수 (진행 중 작업은 항상 보관)
+    CRAWL_ALL_DEADLINE_SECONDS: float = 600.0     # trigger/all 전체 대기 한도 (초과해도 작업은 계속 실행)
+    CRAWL_ALL_HEARTBEAT_SECONDS: float = 15.0     # 결과가 없을 때 pending 줄 전송 간격 (게이트웨이 read timeout 방지)
+
+    # Gateway 응답 캐시 무효화 (크롤링 커밋 후 호출)
+    GATEWAY_URL: str = "http://gateway:80"
+    CACHE_INVALIDATE_TOKEN: str = ""
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,125 @@
+"""
+Metrics - Prometheus 형식 요청 지표 + 요청 ID 전파
+- 순수 ASGI 미들웨어: 라우트 템플릿 단위 요청 수 / 첫 바이트까지 시간(TTFB) / 전체 시간 / 진행 중 요청 / 응답 바이트
+- 스트리밍(NDJSON) 응답은 TTFB와 전체 시간이 크게 다르므로 따로 집계
+- X-Request-ID: 들어온 값을 그대로 쓰거나 새로 발급해 응답 헤더와 contextvar(get_request_id)에 설정
+"""
+import contextvars
+import time
+import uuid
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# 카탈로그 조회(ms)부터 LLM 스트리밍 / 크롤링(분)까지
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "처리한 HTTP 요청 수",
+    ["service", "method", "route", "status"],
+)
+TTFB = Histogram(
+    "http_request_ttfb_seconds",
+    "요청 수신부터 응답 본문 첫 바이트까지",
+    ["service", "method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DURATION = Histogram(
+    "http_request_duration_seconds",
+    "요청 수신부터 응답 본문 마지막 바이트까지",
+    ["service", "method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "처리 중인 HTTP 요청 수",
+    ["service"],
+)
+RESPONSE_BYTES = Counter(
+    "http_response_bytes_total",
+    "응답 본문 바이트 수",
+    ["service", "route"],
+)
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """현재 요청의 X-Request-ID (요청 밖이면 None)."""
+    return _request_id.get()
+
+
+def route_template(scope) -> str:
+    """경로 대신 라우트 템플릿(/api/books/{book_id})을 라벨로 사용 — 라벨 수 고정."""
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """요청 하나의 시작 / 첫 바이트 / 종료 시각을 기록하는 ASGI 미들웨어."""
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        started = time.perf_counter()
+        status = 500
+        first_byte: Optional[float] = None
+        sent_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, first_byte, sent_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.encode(), request_id.encode("latin-1"))
+                ]
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if first_byte is None and (body or not message.get("more_body", False)):
+                    first_byte = time.perf_counter()
+                sent_bytes += len(body)
+            await send(message)
+
+        IN_FLIGHT.labels(self.service).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.labels(self.service).dec()
+            _request_id.reset(token)
+            finished = time.perf_counter()
+            route = route_template(scope)
+            method = scope["method"]
+            REQUESTS.labels(self.service, method, route, str(status)).inc()
+            TTFB.labels(self.service, method, route).observe((first_byte or finished) - started)
+            DURATION.labels(self.service, method, route).observe(finished - started)
+            RESPONSE_BYTES.labels(self.service, route).inc(sent_bytes)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus 스크레이프 엔드포인트."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,36 @@
+"""
+Search Key - 검색용 정규화 키
+- NFKD로 한글 음절을 자모로 분해 (호환 자모 ㄱ~ㅎ도 초성 자모로 통일)
+- 종성을 같은 자음의 초성으로 접어 입력 중인 음절("살" → "사랑")도 접두 일치
+- 소문자화 + 공백/문장부호 제거 ("불편한 편의점" == "불편한편의점")
+크롤링 upsert(books.search_key 저장)와 검색 쿼리 양쪽에서 같은 함수를 사용해야 함.
+"""
+import unicodedata
+
+# 종성(U+11A8~U+11C2) → 초성 자모. 겹받침은 두 자음으로 분리
+_FINAL_TO_INITIAL = {
+    "ᆨ": "ᄀ", "ᆩ": "ᄁ", "ᆪ": "ᄀᄉ",
+    "ᆫ": "ᄂ", "ᆬ": "ᄂᄌ", "ᆭ": "ᄂᄒ",
+    "ᆮ": "ᄃ", "ᆯ": "ᄅ", "ᆰ": "ᄅᄀ",
+    "ᆱ": "ᄅᄆ", "ᆲ": "ᄅᄇ", "ᆳ": "ᄅᄉ",
+    "ᆴ": "ᄅᄐ", "ᆵ": "ᄅᄑ", "ᆶ": "ᄅᄒ",
+    "ᆷ": "ᄆ", "ᆸ": "ᄇ", "ᆹ": "ᄇᄉ",
+    "ᆺ": "ᄉ", "ᆻ": "ᄊ", "ᆼ": "ᄋ",
+    "ᆽ": "ᄌ", "ᆾ": "ᄎ", "ᆿ": "ᄏ",
+    "ᇀ": "ᄐ", "ᇁ": "ᄑ", "ᇂ": "ᄒ",
+}
+_FOLD_TABLE = str.maketrans(_FINAL_TO_INITIAL)
+
+# title / author 키 구분자 — 정규화 결과에는 공백이 없으므로 충돌하지 않음
+KEY_SEPARATOR = " "
+
+
+def normalize_search_text(value: str) -> str:
+    """검색어/원문 공통 정규화 (자모 분해 + 종성 접기 + 소문자 + 공백·기호 제거)."""
+    decomposed = unicodedata.normalize("NFKD", value or "").lower().translate(_FOLD_TABLE)
+    return "".join(ch for ch in decomposed if ch.isalnum())
+
+
+def book_search_key(title: str, author: str) -> str:
+    """books.search_key 값: "<정규화 제목> <정규화 저자>"."""
+    return f"{normalize_search_text(title)}{KEY_SEPARATOR}{normalize_search_text(author)}"
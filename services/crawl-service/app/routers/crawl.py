@@ -1,40 +1,138 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import logging
+import time
+from typing import AsyncGenerator
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
 from app.models.book import CrawlLog
-from app.schemas.book import CrawlStatusOut
-from app.services import crawler_service
+from app.schemas.book import CrawlJobOut, CrawlStatusOut
+from app.services.crawl_jobs import CrawlJob, crawl_jobs
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/crawl", tags=["crawl"])
 
 VALID_STORES = {"kyobo", "millie", "aladdin"}
 
 
-@router.post("/trigger/{store}", response_model=CrawlStatusOut)
-async def trigger_crawl(
-    store: str,
-    db: AsyncSession = Depends(get_db),
-):
-    """특정 서점 크롤링 실행 (백그라운드 실행이 아닌 즉시 실행, 완료 시 결과 반환)."""
+@router.post("/trigger/all")
+async def trigger_all_crawl():
+    """
+    모든 서점 동시 크롤링 — 서점별 작업(독립 세션)을 한꺼번에 등록하고 끝나는 순서대로 스트리밍.
+    /trigger/{store}보다 먼저 선언해야 "all"이 서점 이름으로 잡히지 않음.
+    응답 (JSON Lines):
+      {"type": "store",   "data": {CrawlStatusOut}}                    # 서점 하나 종료
+      {"type": "error",   "data": {"store": ..., "job_id": ..., "error_message": ...}}  # 로그 없이 실패
+      {"type": "pending", "data": {"stores": ["kyobo"]}}               # CRAWL_ALL_HEARTBEAT_SECONDS마다
+      {"type": "timeout", "data": {"stores": [...], "job_ids": [...]}}  # CRAWL_ALL_DEADLINE_SECONDS 초과 (작업은 계속 실행)
+      {"type": "summary", "data": {"done": 3, "error": 0, "timeout": 0, "books_found": 60, "elapsed_ms": ...}}
+    """
+    jobs = [crawl_jobs.submit(store)[0] for store in sorted(VALID_STORES)]
+    return StreamingResponse(
+        _stream_all_crawl(jobs),
+        media_type="application/x-ndjson",
+        headers={"X-Content-Type-Options": "nosniff"},
+    )
+
+
+def _line(event_type: str, data) -> str:
+    return json.dumps({"type": event_type, "data": data}, ensure_ascii=False) + "\n"
+
+
+async def _stream_all_crawl(jobs: list[CrawlJob]) -> AsyncGenerator[str, None]:
+    started = time.perf_counter()
+    summary = {"done": 0, "error": 0, "timeout": 0, "books_found": 0}
+    async for kind, batch in crawl_jobs.as_completed(
+        jobs,
+        deadline=settings.CRAWL_ALL_DEADLINE_SECONDS,
+        heartbeat=settings.CRAWL_ALL_HEARTBEAT_SECONDS,
+    ):
+        if kind == "pending":
+            yield _line("pending", {"stores": [job.store for job in batch]})
+            continue
+        if kind == "timeout":
+            summary["timeout"] = len(batch)
+            yield _line("timeout", {
+                "stores": [job.store for job in batch],
+                "job_ids": [job.id for job in batch],
+            })
+            continue
+
+        job = batch[0]
+        summary["done" if job.status == "done" else "error"] += 1
+        summary["books_found"] += job.books_found
+        log = None
+        if job.log_id is not None:
+            async with AsyncSessionLocal() as db:
+                log = await db.get(CrawlLog, job.log_id)
+        if log is None:
+            yield _line("error", {"store": job.store, "job_id": job.id, "error_message": job.error_message})
+        else:
+            yield _line("store", CrawlStatusOut.model_validate(log).model_dump(mode="json"))
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"🕷️  전체 서점 크롤링 응답 종료: {summary}")
+    yield _line("summary", summary)
+
+
+@router.post("/trigger/{store}", response_model=CrawlJobOut, status_code=202)
+async def trigger_crawl(store: str, response: Response):
+    """
+    특정 서점 크롤링 작업 등록 후 즉시 반환 (202).
+    같은 서점 작업이 진행 중이면 새로 만들지 않고 그 작업을 반환.
+    진행 상황: GET /api/crawl/jobs/{id}, GET /api/crawl/jobs/{id}/events (NDJSON)
+    """
     if store not in VALID_STORES:
         raise HTTPException(
             status_code=400,
             detail=f"지원하지 않는 서점입니다. 지원 목록: {', '.join(VALID_STORES)}"
         )
-    log = await crawler_service.run_crawl(store=store, db=db)
-    return log
-
-
-@router.post("/trigger/all", response_model=list[CrawlStatusOut])
-async def trigger_all_crawl(db: AsyncSession = Depends(get_db)):
-    """모든 서점 크롤링 순차 실행."""
-    results = []
-    for store in VALID_STORES:
-        log = await crawler_service.run_crawl(store=store, db=db)
-        results.append(log)
-    return results
+    job, _ = crawl_jobs.submit(store)
+    response.headers["Location"] = f"{router.prefix}/jobs/{job.id}"
+    return CrawlJobOut.from_job(job)
+
+
+@router.get("/jobs", response_model=list[CrawlJobOut])
+async def list_jobs(limit: int = 20):
+    """최근 크롤링 작업 (진행 중 포함)."""
+    return [CrawlJobOut.from_job(job) for job in crawl_jobs.recent(limit)]
+
+
+@router.get("/jobs/{job_id}", response_model=CrawlJobOut)
+async def get_job(job_id: str):
+    """크롤링 작업 상태 조회."""
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="크롤링 작업을 찾을 수 없습니다.")
+    return CrawlJobOut.from_job(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    크롤링 진행 이벤트 스트리밍 (JSON Lines, 처음부터 재생 후 작업 종료까지):
+      {"seq": 0, "event": "running",       "at": "...", "data": {"store": "kyobo"}}
+      {"seq": 1, "event": "started",       "at": "...", "data": {"log_id": 12, "fetcher": "browser"}}
+      {"seq": 2, "event": "phase",         "at": "...", "data": {"name": "navigate", "ms": 812.4}}
+      {"seq": 5, "event": "page_loaded",   "at": "...", "data": {"url": "..."}}
+      {"seq": 8, "event": "items_parsed",  "at": "...", "data": {"count": 20}}
+      {"seq": 10, "event": "rows_upserted", "at": "...", "data": {"count": 20}}
+      {"seq": 11, "event": "done",         "at": "...", "data": {"log_id": 12, "books_found": 20, ...}}
+    """
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="크롤링 작업을 찾을 수 없습니다.")
+    return StreamingResponse(
+        crawl_jobs.stream_events(job),
+        media_type="application/x-ndjson",
+        headers={"X-Content-Type-Options": "nosniff"},
+    )
 
 
 @router.get("/status", response_model=list[CrawlStatusOut])
@@ -76,6 +76,35 @@ class CrawlStatusOut(BaseModel):
     error_message: Optional[str] = None
     started_at: datetime
     finished_at: Optional[datetime] = None
+    phase_timings: Optional[Dict[str, float]] = None   # 단계별 소요 시간 (ms)
 
     class Config:
         from_attributes = True
+
+
+class CrawlJobOut(BaseModel):
+    id: str
+    store: str
+    status: str                  # queued | running | done | error
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    log_id: Optional[int] = None          # CrawlLog id (/status 이력과 연결)
+    books_found: int = 0
+    error_message: Optional[str] = None
+    events: int = 0                       # 지금까지 기록된 진행 이벤트 수
+
+    @classmethod
+    def from_job(cls, job) -> "CrawlJobOut":
+        return cls(
+            id=job.id,
+            store=job.store,
+            status=job.status,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            log_id=job.log_id,
+            books_found=job.books_found,
+            error_message=job.error_message,
+            events=len(job.events),
+        )
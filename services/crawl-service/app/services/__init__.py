@@ -1,8 +1,10 @@
 from app.services.crawler_service import run_crawl
+from app.services.crawl_jobs import crawl_jobs
 from app.services.scheduler import start_scheduler, stop_scheduler
 
 __all__ = [
     "run_crawl",
+    "crawl_jobs",
     "start_scheduler",
     "stop_scheduler",
 ]
@@ -0,0 +1,83 @@
+"""
+Crawl Executor - 브라우저 워커 풀 기반 병렬 크롤링
+- CRAWL_BROWSER_WORKERS 개의 워커 슬롯을 동시에 운용
+- 워커마다 고유 remote-debugging 포트 / Chrome 프로필 디렉터리 할당
+- Selenium 동기 코드는 전용 스레드 풀에서 실행 (이벤트 루프 비차단)
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BrowserSlot:
+    """브라우저 워커 한 개의 자원 (포트 / 프로필 디렉터리)."""
+
+    def __init__(self, index: int, debugging_port: int, profile_dir: str):
+        self.index = index
+        self.debugging_port = debugging_port
+        self.profile_dir = profile_dir
+
+    def __repr__(self) -> str:
+        return f"<BrowserSlot #{self.index} port={self.debugging_port}>"
+
+
+class CrawlExecutor:
+    """워커 슬롯 수만큼만 동시에 크롤러를 실행하는 bounded 실행기."""
+
+    def __init__(self, workers: int, base_port: int, profile_root: str):
+        self.workers = max(1, workers)
+        self.slots = [
+            BrowserSlot(
+                index=i,
+                debugging_port=base_port + i,
+                profile_dir=os.path.join(profile_root, f"worker-{i}"),
+            )
+            for i in range(self.workers)
+        ]
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._free: Optional[asyncio.Queue] = None
+
+    def _ensure_started(self) -> None:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="crawl-worker"
+            )
+        if self._free is None:
+            self._free = asyncio.Queue()
+            for slot in self.slots:
+                self._free.put_nowait(slot)
+
+    async def run(self, fn: Callable[[BrowserSlot], T]) -> T:
+        """빈 워커 슬롯을 기다렸다가 fn(slot)을 워커 스레드에서 실행."""
+        self._ensure_started()
+        free = self._free
+        slot: BrowserSlot = await free.get()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, fn, slot)
+        except BaseException:
+            free.put_nowait(slot)
+            raise
+        # 호출자가 취소돼도 스레드가 끝날 때까지 슬롯(포트/프로필)은 반환하지 않음
+        future.add_done_callback(lambda _: free.put_nowait(slot))
+        return await future
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._free = None
+
+
+executor = CrawlExecutor(
+    workers=settings.CRAWL_BROWSER_WORKERS,
+    base_port=settings.CRAWL_DEBUG_PORT_BASE,
+    profile_root=settings.CRAWL_PROFILE_ROOT,
+)
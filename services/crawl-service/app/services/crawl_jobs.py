@@ -0,0 +1,195 @@
+"""
+Crawl Jobs - 크롤링 작업 큐 (요청 즉시 job id 반환, 백그라운드 실행)
+- 서점별로 동시에 하나의 작업만 실행: 진행 중인 작업이 있으면 새로 만들지 않고 그 작업을 반환
+- 진행 이벤트(단계 종료 / page_loaded / items_parsed / rows_upserted)는 워커 스레드에서
+  call_soon_threadsafe로 이벤트 루프에 전달되어 작업의 이벤트 목록에 쌓임
+- 이벤트 스트림은 처음부터 재생한 뒤 작업이 끝날 때까지 실시간으로 이어 받음
+- as_completed: 여러 작업(전체 서점 크롤링)을 끝나는 순서대로 전달, 전체 deadline 적용
+- 끝난 작업은 CRAWL_JOB_HISTORY 개까지만 보관
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncGenerator, Optional
+
+from app.core.config import settings
+from app.services.crawler_service import run_crawl_isolated
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class CrawlJob:
+    """크롤링 작업 한 건의 상태와 진행 이벤트."""
+
+    def __init__(self, store: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.store = store
+        self.status = "queued"
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.log_id: Optional[int] = None
+        self.books_found = 0
+        self.error_message: Optional[str] = None
+        self.events: list[dict] = []
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status not in ACTIVE_STATUSES
+
+    def add_event(self, event: str, data: dict) -> None:
+        self.events.append({
+            "seq": len(self.events),
+            "event": event,
+            "at": datetime.utcnow().isoformat(),
+            "data": data,
+        })
+        # 대기 중인 스트림을 깨우고 다음 대기용 이벤트로 교체
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_event(self, cursor: int) -> None:
+        while cursor >= len(self.events) and not self.finished:
+            await self._changed.wait()
+
+
+class CrawlJobManager:
+    """서점별 단일 실행 크롤링 작업 관리자."""
+
+    def __init__(self, history: int):
+        self.history = history
+        self._jobs: "OrderedDict[str, CrawlJob]" = OrderedDict()
+        self._active: dict[str, CrawlJob] = {}
+
+    def get(self, job_id: str) -> Optional[CrawlJob]:
+        return self._jobs.get(job_id)
+
+    def recent(self, limit: int = 20) -> list[CrawlJob]:
+        return list(reversed(self._jobs.values()))[:limit]
+
+    def submit(self, store: str) -> tuple[CrawlJob, bool]:
+        """
+        store 크롤링 작업 등록. 반환: (작업, 새로 만들었는지 여부)
+        같은 서점 작업이 진행 중이면 그 작업을 반환 (중복 실행 방지).
+        """
+        active = self._active.get(store)
+        if active is not None:
+            return active, False
+
+        job = CrawlJob(store)
+        self._jobs[job.id] = job
+        self._active[store] = job
+        job.task = asyncio.create_task(self._run(job))
+        self._prune()
+        logger.info(f"🧾 [{store}] 크롤링 작업 등록 job={job.id}")
+        return job, True
+
+    async def _run(self, job: CrawlJob) -> None:
+        loop = asyncio.get_running_loop()
+
+        def progress(event: str, data: dict) -> None:
+            # 워커 스레드에서도 호출되므로 항상 루프로 넘겨서 기록
+            loop.call_soon_threadsafe(job.add_event, event, data)
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        job.add_event("running", {"store": job.store})
+        try:
+            log = await run_crawl_isolated(job.store, progress=progress)
+            job.log_id = log.id
+            job.books_found = log.books_found
+            job.error_message = log.error_message
+            job.status = log.status
+        except asyncio.CancelledError:
+            job.status = "error"
+            job.error_message = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"❌ [{job.store}] 크롤링 작업 실패 job={job.id}: {e}")
+            job.status = "error"
+            job.error_message = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+            if self._active.get(job.store) is job:
+                del self._active[job.store]
+            job.add_event(job.status, {
+                "log_id": job.log_id,
+                "books_found": job.books_found,
+                "error_message": job.error_message,
+            })
+
+    async def wait(self, job: CrawlJob) -> CrawlJob:
+        """작업이 끝날 때까지 대기 (취소되어도 작업은 계속 실행)."""
+        if job.task is not None and not job.task.done():
+            await asyncio.shield(job.task)
+        return job
+
+    async def as_completed(
+        self,
+        jobs: list[CrawlJob],
+        deadline: float,
+        heartbeat: float,
+    ) -> AsyncGenerator[tuple[str, list[CrawlJob]], None]:
+        """
+        여러 작업을 끝나는 순서대로 전달:
+          ("done", [작업])          — 작업 하나 종료
+          ("pending", 남은 작업들)  — heartbeat초 동안 끝난 작업이 없음
+          ("timeout", 남은 작업들)  — deadline 초과 (작업 자체는 취소하지 않고 계속 실행)
+        """
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + deadline
+        waiters = {asyncio.ensure_future(self.wait(job)): job for job in jobs}
+        try:
+            while waiters:
+                remaining = expires - loop.time()
+                if remaining <= 0:
+                    yield "timeout", list(waiters.values())
+                    return
+                done, _ = await asyncio.wait(
+                    waiters, timeout=min(remaining, heartbeat), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    if loop.time() < expires:
+                        yield "pending", list(waiters.values())
+                    continue
+                for waiter in sorted(done, key=lambda w: waiters[w].store):
+                    yield "done", [waiters.pop(waiter)]
+        finally:
+            # 대기만 정리 — wait()가 shield하므로 작업은 영향 없음
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def stream_events(self, job: CrawlJob) -> AsyncGenerator[str, None]:
+        """진행 이벤트 NDJSON — 처음부터 재생 후 작업 종료까지 이어서 전달."""
+        cursor = 0
+        while True:
+            if cursor < len(job.events):
+                event = job.events[cursor]
+                cursor += 1
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+            elif job.finished:
+                return
+            else:
+                await job.wait_for_event(cursor)
+
+    def _prune(self) -> None:
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.history:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
+
+    async def stop(self) -> None:
+        for job in list(self._active.values()):
+            if job.task is not None:
+                job.task.cancel()
+
+
+crawl_jobs = CrawlJobManager(history=settings.CRAWL_JOB_HISTORY)
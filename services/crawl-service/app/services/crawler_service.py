@@ -1,81 +1,88 @@
 """
 Crawler Service - Selenium + ChromeDriver (headless) 기반
 각 서점(교보문고, 알라딘, 밀리의서재) 베스트셀러 크롤링
+서버 렌더링 페이지는 브라우저 없이 HTTP + HTML 파서로 수집 (CRAWL_STORE_FETCHERS)
 """
 import asyncio
 import logging
-import time
+import threading
 import os
 from datetime import datetime
+from functools import lru_cache, partial
 from typing import Optional
 
+import httpx
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert as sa_insert
 
 from app.core.config import settings
-from app.models.book import Book, BookRanking, CrawlLog
+from app.core.database import AsyncSessionLocal
+from app.core.search_key import book_search_key
+from app.models.book import Book, BookRanking, CrawlLog, CurrentBestseller
+from app.services.crawl_executor import BrowserSlot, executor
+from app.services.extraction import (
+    STORE_SPECS,
+    extract_rows_bulk,
+    extract_rows_element,
+    extract_rows_html,
+    rows_to_books,
+)
+from app.services.page_readiness import (
+    PhaseTimer,
+    ProgressCallback,
+    drain_performance_log,
+    trigger_lazy_load,
+    wait_for_images,
+    wait_for_item_count,
+    wait_for_network_idle,
+)
 
 logger = logging.getLogger(__name__)
 
-STORE_COLORS = {
-    "kyobo":   "#C4956A",
-    "millie":  "#7BA08A",
-    "aladdin": "#5B8FA8",
-}
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
 
-GENRE_MAP = {
-    "소설": "소설",
-    "자기계발": "자기계발",
-    "경제": "경제/경영",
-    "경영": "경제/경영",
-    "역사": "역사/문화",
-    "과학": "과학",
-    "에세이": "에세이",
-    "시": "시/에세이",
-    "아동": "아동",
-    "청소년": "청소년",
-}
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """chromedriver 경로 조회 (프로세스당 1회 — ChromeDriverManager 조회 반복 방지)."""
+    # Docker 환경 등에서 시스템 chromedriver를 우선 사용하도록 설정
+    for chromedriver_path in ("/usr/bin/chromedriver", "/usr/local/bin/chromedriver"):
+        if os.path.exists(chromedriver_path):
+            logger.info(f"Using system chromedriver: {chromedriver_path}")
+            return chromedriver_path
+    logger.info("System chromedriver not found. Installing via ChromeDriverManager...")
+    return ChromeDriverManager().install()
 
 
-def _build_chrome_driver() -> webdriver.Chrome:
-    """공통 ChromeDriver 생성 (headless, 봇 감지 우회)."""
+def _build_chrome_driver(slot: BrowserSlot) -> webdriver.Chrome:
+    """공통 ChromeDriver 생성 (headless, 봇 감지 우회, 워커별 포트/프로필 분리)."""
     opts = Options()
     opts.add_argument("--headless=new")
     opts.add_argument("--no-sandbox")
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--disable-gpu")
     opts.add_argument("--disable-software-rasterizer")
-    opts.add_argument("--remote-debugging-port=9222")
+    opts.add_argument(f"--remote-debugging-port={slot.debugging_port}")
+    opts.add_argument(f"--user-data-dir={slot.profile_dir}")
     opts.add_argument("--window-size=1920,1080")
-    opts.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/122.0.0.0 Safari/537.36"
-    )
+    opts.add_argument(f"--user-agent={USER_AGENT}")
     # 봇 감지 방지
     opts.add_experimental_option("excludeSwitches", ["enable-automation"])
     opts.add_experimental_option("useAutomationExtension", False)
+    # 네트워크 idle 판단용 CDP Network 이벤트 수집
+    opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
-    # Docker 환경 등에서 시스템 chromedriver를 우선 사용하도록 설정
-    chromedriver_path = "/usr/bin/chromedriver"
-    if not os.path.exists(chromedriver_path):
-        chromedriver_path = "/usr/local/bin/chromedriver"
-        
-    if os.path.exists(chromedriver_path):
-        logger.info(f"Using system chromedriver: {chromedriver_path}")
-        service = Service(executable_path=chromedriver_path)
-    else:
-        logger.info("System chromedriver not found. Installing via ChromeDriverManager...")
-        service = Service(ChromeDriverManager().install())
-    
+    service = Service(executable_path=_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=opts)
     driver.execute_cdp_cmd(
         "Page.addScriptToEvaluateOnNewDocument",
@@ -84,286 +91,411 @@ def _build_chrome_driver() -> webdriver.Chrome:
     return driver
 
 
-def _scroll_to_bottom(driver):
-    """지연 로딩된 이미지를 위해 페이지 끝까지 스크롤."""
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-
+# ── Warm Driver Pool ─────────────────────────────────────────────────────────
 
-def _safe_find(driver, by: By, selector: str, timeout: int = 10) -> Optional[object]:
-    """None 반환하는 safe WebDriverWait 래퍼."""
+def _process_tree_rss_mb(pid: int) -> Optional[float]:
+    """chromedriver 프로세스 트리(Chrome 포함) RSS 합계(MB). /proc 미지원 환경이면 None."""
+    total_kb = 0
+    stack = [pid]
     try:
-        return WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((by, selector))
-        )
-    except TimeoutException:
-        return None
+        while stack:
+            current = stack.pop()
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                stack.extend(int(child) for child in f.read().split())
+    except (OSError, ValueError):
+        if total_kb == 0:
+            return None
+    return total_kb / 1024
+
+
+def _driver_rss_mb(driver: webdriver.Chrome) -> Optional[float]:
+    process = getattr(driver.service, "process", None)
+    return _process_tree_rss_mb(process.pid) if process else None
+
+
+def _reset_driver_state(driver: webdriver.Chrome) -> None:
+    """다음 크롤링을 위해 쿠키 / 스토리지 / 캐시 초기화 후 빈 페이지로 이동."""
+    try:
+        origin = driver.execute_script("return window.location.origin")
+        if origin and origin != "null":
+            driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+            )
+    except WebDriverException:
+        pass
+    driver.delete_all_cookies()
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.get("about:blank")
 
 
-# ── 교보문고 ─────────────────────────────────────────────────────────────────
+class _PooledDriver:
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.pages = 0
+        self.baseline_rss_mb = _driver_rss_mb(driver)
 
-def _crawl_kyobo_sync() -> list[dict]:
-    """교보문고 종합 베스트셀러 크롤링 (동기)."""
-    driver = _build_chrome_driver()
-    books: list[dict] = []
-    try:
-        # 최신 URL로 업데이트
-        url = "https://product.kyobobook.co.kr/bestseller/online"
-        driver.get(url)
-        time.sleep(settings.CRAWL_DELAY_SECONDS + 2)
-        
-        # 스크롤하여 이미지 로드 유도
-        _scroll_to_bottom(driver)
-
-        wait = WebDriverWait(driver, 20)
+
+class DriverPool:
+    """
+    워커 슬롯별 headless Chrome을 warm 상태로 유지.
+    - 재사용 전 health-check, 실패 시 재생성
+    - CRAWL_DRIVER_MAX_PAGES 페이지 또는 메모리 증가량 초과 시 재생성
+    - 반납 시 쿠키/스토리지 초기화
+    """
+
+    def __init__(self, max_pages: int, max_memory_growth_mb: float):
+        self.max_pages = max_pages
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self._drivers: dict[int, _PooledDriver] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_healthy(driver: webdriver.Chrome) -> bool:
         try:
-            items = wait.until(
-                EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "li.prod_item")
-                )
-            )
-        except TimeoutException:
-            logger.warning("[kyobo] 상품 목록을 찾지 못했습니다.")
-            return books
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _quit(driver: webdriver.Chrome) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"driver.quit 실패: {e}")
+
+    def _needs_recycle(self, pooled: _PooledDriver) -> Optional[str]:
+        if pooled.pages >= self.max_pages:
+            return f"{pooled.pages} pages"
+        if pooled.baseline_rss_mb is not None:
+            rss = _driver_rss_mb(pooled.driver)
+            if rss is not None and rss - pooled.baseline_rss_mb > self.max_memory_growth_mb:
+                return f"rss +{rss - pooled.baseline_rss_mb:.0f}MB"
+        return None
 
-        for rank, item in enumerate(items[:20], start=1):
+    def acquire(self, slot: BrowserSlot) -> webdriver.Chrome:
+        """슬롯의 warm 드라이버 반환 (없거나 비정상이면 새로 생성)."""
+        with self._lock:
+            pooled = self._drivers.pop(slot.index, None)
+        if pooled is not None:
+            if self._is_healthy(pooled.driver):
+                with self._lock:
+                    self._drivers[slot.index] = pooled
+                return pooled.driver
+            logger.warning(f"{slot} 드라이버 health-check 실패 → 재생성")
+            self._quit(pooled.driver)
+
+        pooled = _PooledDriver(_build_chrome_driver(slot))
+        with self._lock:
+            self._drivers[slot.index] = pooled
+        return pooled.driver
+
+    def release(self, slot: BrowserSlot, pages: int = 1) -> None:
+        """크롤링 종료 후 반납: 상태 초기화, 재생성 기준 초과 시 종료."""
+        with self._lock:
+            pooled = self._drivers.get(slot.index)
+        if pooled is None:
+            return
+        pooled.pages += pages
+        reason = self._needs_recycle(pooled)
+        if reason is None:
             try:
-                # 새 사이트 구조에 맞춘 셀렉터
-                title_el = item.find_element(By.CSS_SELECTOR, ".prod_name, a.prod_info")
-                author_el = item.find_element(By.CSS_SELECTOR, ".prod_author")
-                title = title_el.text.strip()
-                author = author_el.text.strip().split(" ·")[0] # 저자 정보 분리
-
-                try:
-                    genre_el = item.find_element(By.CSS_SELECTOR, ".prod_category")
-                    genre = GENRE_MAP.get(genre_el.text.strip(), genre_el.text.strip())
-                except NoSuchElementException:
-                    genre = "종합"
-
-                try:
-                    img_el = item.find_element(By.CSS_SELECTOR, ".prod_thumb_box img")
-                    image_url = img_el.get_attribute("src")
-                    # data-src 속성이 있는 경우 우선 사용
-                    image_url = img_el.get_attribute("data-src") or image_url
-                except NoSuchElementException:
-                    image_url = None
-
-                books.append({
-                    "title": title,
-                    "author": author,
-                    "genre": genre,
-                    "cover_color": STORE_COLORS["kyobo"],
-                    "image_url": image_url,
-                    "rank": rank,
-                    "store": "kyobo",
-                    "category": "종합 베스트셀러",
-                })
-            except Exception as e:
-                logger.debug(f"[kyobo] item 파싱 실패: {e}")
-                continue
-    except Exception as e:
-        logger.error(f"[kyobo] 크롤링 오류: {e}")
-    finally:
-        driver.quit()
-    return books
+                _reset_driver_state(pooled.driver)
+                return
+            except WebDriverException as e:
+                reason = f"reset 실패: {e.__class__.__name__}"
+        logger.info(f"{slot} 드라이버 재생성 예정 ({reason})")
+        self.discard(slot)
 
+    def discard(self, slot: BrowserSlot) -> None:
+        with self._lock:
+            pooled = self._drivers.pop(slot.index, None)
+        if pooled is not None:
+            self._quit(pooled.driver)
 
-# ── 알라딘 ───────────────────────────────────────────────────────────────────
+    def prewarm(self, slot: BrowserSlot) -> None:
+        self.acquire(slot)
+        self.release(slot, pages=0)
+
+    def close_all(self) -> None:
+        with self._lock:
+            drivers = list(self._drivers.values())
+            self._drivers.clear()
+        for pooled in drivers:
+            self._quit(pooled.driver)
+
+
+driver_pool = DriverPool(
+    max_pages=settings.CRAWL_DRIVER_MAX_PAGES,
+    max_memory_growth_mb=settings.CRAWL_DRIVER_MAX_MEMORY_GROWTH_MB,
+)
+
+
+BESTSELLER_SIZE = 20
 
-def _crawl_aladdin_sync() -> list[dict]:
-    """알라딘 베스트셀러 크롤링 (동기)."""
-    driver = _build_chrome_driver()
-    books: list[dict] = []
-    try:
-        url = "https://www.aladin.co.kr/shop/common/wbest.aspx?BestType=Bestseller&BranchType=1&CID=0&cnt=20&SortOrder=1"
-        driver.get(url)
-        time.sleep(settings.CRAWL_DELAY_SECONDS + 1)
-        
-        _scroll_to_bottom(driver)
 
-        wait = WebDriverWait(driver, 20)
+def _load_list_page(driver, store: str, spec: dict, timer: PhaseTimer) -> bool:
+    """
+    목록 페이지 이동 후 고정 sleep 없이 준비 조건을 대기.
+    (상품 BESTSELLER_SIZE개 도달 → [네트워크 idle] → lazy 이미지 src 채워짐)
+    """
+    item_selector = spec["item"]
+    with timer.phase("navigate"):
+        drain_performance_log(driver)
+        driver.get(spec["url"])
+
+    with timer.phase("ready"):
+        found = wait_for_item_count(
+            driver, item_selector, BESTSELLER_SIZE, settings.CRAWL_READY_TIMEOUT_SECONDS
+        )
+        if not found:
+            logger.warning(f"[{store}] 상품 목록을 찾지 못했습니다.")
+            return False
+        if spec.get("network_idle"):
+            wait_for_network_idle(driver, timeout=settings.CRAWL_IMAGE_TIMEOUT_SECONDS)
+    timer.emit("page_loaded", url=spec["url"])
+
+    with timer.phase("images"):
+        # 이미지 로드는 best-effort — rAF가 throttle된 탭의 스크립트 타임아웃 등으로
+        # 이미 준비된 목록의 추출까지 버리지 않음
         try:
-            items = wait.until(
-                EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "div.ss_book_box")
-                )
+            trigger_lazy_load(driver, item_selector, BESTSELLER_SIZE)
+            wait_for_images(
+                driver, item_selector, spec["image"], BESTSELLER_SIZE,
+                timeout=settings.CRAWL_IMAGE_TIMEOUT_SECONDS,
             )
-        except TimeoutException:
-            logger.warning("[aladdin] 상품 목록을 찾지 못했습니다.")
+        except WebDriverException as e:
+            logger.warning(f"[{store}] lazy 이미지 대기 실패, 현재 상태로 추출 계속: {e.__class__.__name__}")
+    return True
+
+
+def _crawl_store_sync(store: str, slot: BrowserSlot, timer: PhaseTimer) -> list[dict]:
+    """서점 베스트셀러 크롤링 (동기). 셀렉터/URL은 extraction.STORE_SPECS에 선언."""
+    spec = STORE_SPECS[store]
+    timer.mark("queue")
+    with timer.phase("driver"):
+        driver = driver_pool.acquire(slot)
+    books: list[dict] = []
+    try:
+        if not _load_list_page(driver, store, spec, timer):
             return books
 
-        for rank, item in enumerate(items[:20], start=1):
-            try:
-                # 정교한 셀렉터로 업데이트
-                title_el = item.find_element(By.CSS_SELECTOR, "a.bo3")
-                # 저자 링크가 여러개일 수 있으므로 AuthorSearch 포함된 링크 활용
-                author_els = item.find_elements(By.CSS_SELECTOR, "a[href*='AuthorSearch']")
-                title = title_el.text.strip()
-                author = author_els[0].text.strip() if author_els else "저자 미상"
-
-                try:
-                    # 첫 번째 li 태그의 텍스트에서 카테고리 추출 시도
-                    category_el = item.find_element(By.CSS_SELECTOR, "div.ss_book_list ul li")
-                    genre_text = category_el.text.strip()
-                    genre = genre_text.split("]")[0].replace("[", "") if "]" in genre_text else "종합"
-                    genre = GENRE_MAP.get(genre, genre)
-                except NoSuchElementException:
-                    genre = "종합"
-
-                try:
-                    img_el = item.find_element(By.CSS_SELECTOR, "img.front_cover")
-                    image_url = img_el.get_attribute("src")
-                except NoSuchElementException:
-                    image_url = None
-
-                books.append({
-                    "title": title,
-                    "author": author,
-                    "genre": genre,
-                    "cover_color": STORE_COLORS["aladdin"],
-                    "image_url": image_url,
-                    "rank": rank,
-                    "store": "aladdin",
-                    "category": "주간 베스트",
-                })
-            except Exception as e:
-                logger.debug(f"[aladdin] item 파싱 실패: {e}")
-                continue
+        with timer.phase("extract"):
+            if settings.CRAWL_EXTRACTION_MODE == "element":
+                rows = extract_rows_element(driver, spec, BESTSELLER_SIZE)
+            else:
+                rows = extract_rows_bulk(driver, spec, BESTSELLER_SIZE)
+            books = rows_to_books(store, rows)
+        timer.emit("items_parsed", count=len(books))
     except Exception as e:
-        logger.error(f"[aladdin] 크롤링 오류: {e}")
+        logger.error(f"[{store}] 크롤링 오류: {e}")
     finally:
-        driver.quit()
+        driver_pool.release(slot)
     return books
 
 
-# ── 밀리의서재 ───────────────────────────────────────────────────────────────
+# ── Fetchers ─────────────────────────────────────────────────────────────────
 
-def _crawl_millie_sync() -> list[dict]:
-    """밀리의서재 베스트셀러 크롤링 (동기)."""
-    driver = _build_chrome_driver()
-    books: list[dict] = []
-    try:
-        url = "https://www.millie.co.kr/v3/today/more/best/bookstore/total"
-        driver.get(url)
-        # JS 렌더링 및 페이지 구성 대기
-        time.sleep(settings.CRAWL_DELAY_SECONDS + 3)
-        _scroll_to_bottom(driver)
+class BrowserFetcher:
+    """headless Chrome 워커 풀에서 페이지를 렌더링해 추출."""
 
-        wait = WebDriverWait(driver, 25)
+    name = "browser"
+
+    async def fetch(self, store: str, timer: PhaseTimer) -> list[dict]:
+        return await executor.run(partial(_crawl_store_sync, store, timer=timer))
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(driver_pool.close_all)
+
+
+class HttpFetcher:
+    """
+    서버 렌더링 HTML을 pooled httpx 클라이언트로 받아 같은 셀렉터로 파싱.
+    파싱 결과가 비면 (마크업 변경, JS 렌더링 전환 등) 브라우저로 폴백.
+    """
+
+    name = "http"
+
+    def __init__(self, fallback: BrowserFetcher):
+        self.fallback = fallback
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={
+                    "User-Agent": USER_AGENT,
+                    "Accept-Language": "ko-KR,ko;q=0.9",
+                },
+                timeout=settings.CRAWL_READY_TIMEOUT_SECONDS,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
+
+    async def fetch(self, store: str, timer: PhaseTimer) -> list[dict]:
+        spec = STORE_SPECS[store]
         try:
-            # v3 그리드 리스트 아이템
-            items = wait.until(
-                EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "div.book-list li")
+            with timer.phase("fetch"):
+                response = await self.client.get(spec["url"])
+                response.raise_for_status()
+            timer.emit("page_loaded", url=spec["url"])
+            with timer.phase("extract"):
+                rows = await asyncio.to_thread(
+                    extract_rows_html, response.text, spec, BESTSELLER_SIZE
                 )
-            )
-        except TimeoutException:
-            logger.warning("[millie] 상품 목록을 찾지 못했습니다.")
+                books = rows_to_books(store, rows)
+            timer.emit("items_parsed", count=len(books))
+        except httpx.HTTPError as e:
+            logger.warning(f"[{store}] HTTP 수집 실패: {e!r}")
+            books = []
+
+        if books:
             return books
+        logger.warning(f"[{store}] HTTP 파싱 결과 없음 → 브라우저로 폴백")
+        return await self.fallback.fetch(store, timer)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-        for rank, item in enumerate(items[:20], start=1):
-            try:
-                # Millie v3 메타데이터 추출 (Title: 뒤에서 2번째 p, Author: 마지막 p)
-                meta_els = item.find_elements(By.CSS_SELECTOR, "a.book-data p")
-                if len(meta_els) < 2: continue
-                
-                title = meta_els[-2].text.strip()
-                author = meta_els[-1].text.strip()
-
-                try:
-                    img_el = item.find_element(By.CSS_SELECTOR, "a.book-cover-link img")
-                    image_url = img_el.get_attribute("src")
-                except NoSuchElementException:
-                    image_url = None
-
-                books.append({
-                    "title": title,
-                    "author": author,
-                    "genre": "종합",
-                    "cover_color": STORE_COLORS["millie"],
-                    "image_url": image_url,
-                    "rank": rank,
-                    "store": "millie",
-                    "category": "베스트셀러",
-                })
-            except Exception as e:
-                logger.debug(f"[millie] item 파싱 실패: {e}")
-                continue
-    except Exception as e:
-        logger.error(f"[millie] 크롤링 오류: {e}")
-    finally:
-        driver.quit()
-    return books
+
+_browser_fetcher = BrowserFetcher()
+FETCHERS = {
+    "browser": _browser_fetcher,
+    "http": HttpFetcher(fallback=_browser_fetcher),
+}
+
+
+def get_fetcher(store: str):
+    """서점별 fetcher 선택 (CRAWL_STORE_FETCHERS 미지정 서점은 browser)."""
+    kind = settings.CRAWL_STORE_FETCHERS.get(store, "browser")
+    fetcher = FETCHERS.get(kind)
+    if fetcher is None:
+        raise ValueError(f"알 수 없는 fetcher: {kind} ({store})")
+    return fetcher
 
 
 # ── DB 저장 헬퍼 ──────────────────────────────────────────────────────────────
 
+def _dialect_insert(db: AsyncSession):
+    """ON CONFLICT를 지원하는 dialect별 insert 구성자 (PostgreSQL / SQLite)."""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
 async def _upsert_books(db: AsyncSession, raw_books: list[dict], store: str) -> int:
-    """크롤링된 도서 데이터를 DB에 upsert하고 저장 건수를 반환."""
-    saved = 0
+    """
+    크롤링된 도서 데이터를 DB에 upsert하고 저장 건수를 반환.
+    도서는 (title, author) 기준 multi-row INSERT ... ON CONFLICT 1회로 id를 일괄 확보,
+    랭킹은 multi-row INSERT 1회 — 하나의 트랜잭션으로 커밋.
+    """
+    if not raw_books:
+        return 0
+
+    now = datetime.utcnow()
+    # 한 문장 안에서 같은 키가 두 번 갱신될 수 없으므로 (title, author) 중복 제거
+    unique: dict[tuple[str, str], dict] = {}
     for raw in raw_books:
-        # 기존 도서 조회 (title + author 기준)
-        result = await db.execute(
-            select(Book).where(
-                Book.title == raw["title"],
-                Book.author == raw["author"],
-            )
-        )
-        book = result.scalars().first()
-
-        if book is None:
-            book = Book(
-                title=raw["title"],
-                author=raw["author"],
-                genre=raw.get("genre"),
-                description=raw.get("description"),
-                cover_color=raw.get("cover_color", "#5B8FA8"),
-                rating=raw.get("rating"),
-                image_url=raw.get("image_url"),
-                crawled_at=datetime.utcnow(),
-            )
-            db.add(book)
-            await db.flush()
-        else:
-            book.crawled_at = datetime.utcnow()
-            if raw.get("description"):
-                book.description = raw["description"]
-            if raw.get("rating"):
-                book.rating = raw["rating"]
-
-        # 랭킹 저장
-        ranking = BookRanking(
-            book_id=book.id,
-            store=store,
-            category=raw.get("category", "베스트셀러"),
-            rank=raw["rank"],
-        )
-        db.add(ranking)
-        saved += 1
+        unique.setdefault((raw["title"], raw["author"]), raw)
+
+    insert = _dialect_insert(db)(Book).values([
+        {
+            "title": raw["title"],
+            "author": raw["author"],
+            "genre": raw.get("genre"),
+            "description": raw.get("description"),
+            "cover_color": raw.get("cover_color", "#5B8FA8"),
+            "rating": raw.get("rating"),
+            "image_url": raw.get("image_url"),
+            "search_key": book_search_key(raw["title"], raw["author"]),
+            "crawled_at": now,
+        }
+        for raw in unique.values()
+    ])
+    upsert = insert.on_conflict_do_update(
+        index_elements=[Book.title, Book.author],
+        set_={
+            "crawled_at": insert.excluded.crawled_at,
+            "updated_at": func.now(),
+            "description": func.coalesce(insert.excluded.description, Book.description),
+            "rating": func.coalesce(insert.excluded.rating, Book.rating),
+            "search_key": insert.excluded.search_key,
+        },
+    ).returning(Book.id, Book.title, Book.author)
+    result = await db.execute(upsert)
+    book_ids = {(title, author): book_id for book_id, title, author in result.all()}
+
+    # 랭킹 저장 (같은 크롤링의 랭킹은 동일한 rank_date)
+    rankings = [
+        {
+            "book_id": book_ids[(raw["title"], raw["author"])],
+            "store": store,
+            "category": raw.get("category", "베스트셀러"),
+            "rank": raw["rank"],
+            "rank_date": now,
+        }
+        for raw in raw_books
+    ]
+    await db.execute(sa_insert(BookRanking).values(rankings))
+    await _replace_current_bestsellers(db, store, rankings)
 
     await db.commit()
-    return saved
+    return len(raw_books)
 
 
-# ── Public API ────────────────────────────────────────────────────────────────
+async def _replace_current_bestsellers(db: AsyncSession, store: str, rankings: list[dict]) -> None:
+    """
+    서점의 현재 베스트셀러 스냅샷을 이번 크롤링 랭킹으로 교체 (커밋은 호출자 트랜잭션에서).
+    같은 (도서, 카테고리)가 여러 번 잡히면 가장 높은 순위만 유지.
+    """
+    best: dict[tuple[int, Optional[str]], dict] = {}
+    for row in rankings:
+        key = (row["book_id"], row["category"])
+        if key not in best or row["rank"] < best[key]["rank"]:
+            best[key] = row
+    await db.execute(delete(CurrentBestseller).where(CurrentBestseller.store == store))
+    await db.execute(sa_insert(CurrentBestseller).values(list(best.values())))
+
+
+# ── Gateway 캐시 무효화 ───────────────────────────────────────────────────────
+
+async def _invalidate_gateway_cache() -> None:
+    """크롤링 결과 커밋 후 Gateway의 도서 카탈로그 응답 캐시 무효화 (best-effort)."""
+    headers = {}
+    if settings.CACHE_INVALIDATE_TOKEN:
+        headers["X-Cache-Token"] = settings.CACHE_INVALIDATE_TOKEN
+    try:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.post(
+                f"{settings.GATEWAY_URL.rstrip('/')}/gateway/cache/invalidate",
+                params={"prefix": "api/books"},
+                headers=headers,
+            )
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning(f"Gateway 캐시 무효화 실패 (TTL 만료 후 반영됨): {e!r}")
 
-CRAWLERS = {
-    "kyobo":   _crawl_kyobo_sync,
-    "millie":  _crawl_millie_sync,
-    "aladdin": _crawl_aladdin_sync,
-}
 
+# ── Public API ────────────────────────────────────────────────────────────────
 
-async def run_crawl(store: str, db: AsyncSession) -> CrawlLog:
+async def run_crawl(
+    store: str,
+    db: AsyncSession,
+    progress: Optional[ProgressCallback] = None,
+) -> CrawlLog:
     """
     지정된 서점 크롤링 실행.
-    Selenium은 동기 코드이므로 asyncio.to_thread로 별도 스레드에서 실행.
+    browser fetcher는 Selenium 동기 코드를 브라우저 워커 풀(crawl_executor)의 스레드에서 실행.
+    progress(event, data)는 단계 / 진행 이벤트마다 호출 (워커 스레드에서 호출될 수 있음).
     """
     from app.models.book import CrawlLog as CrawlLogModel
 
@@ -371,27 +503,61 @@ async def run_crawl(store: str, db: AsyncSession) -> CrawlLog:
     db.add(log)
     await db.commit()
     await db.refresh(log)
+    log_id = log.id
+    timer = PhaseTimer(on_event=progress)
 
     try:
-        crawler_fn = CRAWLERS.get(store)
-        if crawler_fn is None:
+        if store not in STORE_SPECS:
             raise ValueError(f"알 수 없는 서점: {store}")
+        fetcher = get_fetcher(store)
 
-        logger.info(f"[{store}] 크롤링 시작")
-        raw_books: list[dict] = await asyncio.to_thread(crawler_fn)
-        logger.info(f"[{store}] {len(raw_books)}건 수집 완료")
+        logger.info(f"[{store}] 크롤링 시작 ({fetcher.name})")
+        timer.emit("started", log_id=log.id, fetcher=fetcher.name)
+        raw_books: list[dict] = await fetcher.fetch(store, timer)
+        logger.info(f"[{store}] {len(raw_books)}건 수집 완료 {timer.timings}")
 
-        count = await _upsert_books(db, raw_books, store)
+        with timer.phase("upsert"):
+            count = await _upsert_books(db, raw_books, store)
+        timer.emit("rows_upserted", count=count)
+        log.phase_timings = timer.timings
 
         log.status = "done"
         log.books_found = count
         log.finished_at = datetime.utcnow()
     except Exception as e:
         logger.error(f"[{store}] 크롤링 실패: {e}")
+        # upsert 배치 실패 시 트랜잭션이 중단된 상태 — 롤백 후 로그를 다시 읽어 error로 기록
+        await db.rollback()
+        log = await db.get(CrawlLogModel, log_id)
         log.status = "error"
         log.error_message = str(e)
         log.finished_at = datetime.utcnow()
+        log.phase_timings = timer.timings
 
     await db.commit()
     await db.refresh(log)
+
+    if log.status == "done" and log.books_found:
+        await _invalidate_gateway_cache()
     return log
+
+
+async def run_crawl_isolated(store: str, progress: Optional[ProgressCallback] = None) -> CrawlLog:
+    """서점별 독립 세션으로 크롤링 (AsyncSession은 동시 사용 불가)."""
+    async with AsyncSessionLocal() as db:
+        return await run_crawl(store=store, db=db, progress=progress)
+
+
+async def prewarm_drivers() -> None:
+    """모든 워커 슬롯에 Chrome을 미리 띄워둠 (수동 trigger 첫 호출 지연 제거)."""
+    await asyncio.gather(
+        *(executor.run(driver_pool.prewarm) for _ in executor.slots),
+        return_exceptions=True,
+    )
+    logger.info(f"🔥 Chrome 드라이버 {len(executor.slots)}개 warm-up 완료")
+
+
+async def close_fetchers() -> None:
+    """앱 종료 시 HTTP 클라이언트 / warm 드라이버 정리."""
+    for fetcher in FETCHERS.values():
+        await fetcher.aclose()
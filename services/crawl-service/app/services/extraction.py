@@ -0,0 +1,225 @@
+"""
+Extraction - 서점별 셀렉터 선언 + 목록 일괄 추출
+- bulk 모드: execute_script 1회로 전체 항목을 JSON으로 받아옴 (WebDriver 왕복 1회)
+- element 모드: 같은 셀렉터로 항목별 find_element 호출 (디버깅/호환용)
+- html 모드: 브라우저 없이 받은 HTML을 같은 셀렉터로 파싱 (HttpFetcher)
+- 추출된 row는 rows_to_books()에서 서점별 규칙으로 기존 book dict 형태로 변환
+"""
+import logging
+from typing import Optional
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+STORE_COLORS = {
+    "kyobo":   "#C4956A",
+    "millie":  "#7BA08A",
+    "aladdin": "#5B8FA8",
+}
+
+GENRE_MAP = {
+    "소설": "소설",
+    "자기계발": "자기계발",
+    "경제": "경제/경영",
+    "경영": "경제/경영",
+    "역사": "역사/문화",
+    "과학": "과학",
+    "에세이": "에세이",
+    "시": "시/에세이",
+    "아동": "아동",
+    "청소년": "청소년",
+}
+
+# field 규칙: css — 항목 내부 셀렉터 / attrs — 값이 있는 첫 속성 사용 (없으면 텍스트)
+#             many — 매칭되는 모든 요소의 텍스트 목록
+STORE_SPECS: dict[str, dict] = {
+    "kyobo": {
+        "url": "https://product.kyobobook.co.kr/bestseller/online",
+        "category": "종합 베스트셀러",
+        "item": "li.prod_item",
+        "image": ".prod_thumb_box img",
+        "network_idle": False,
+        "fields": {
+            "title": {"css": ".prod_name, a.prod_info"},
+            "author": {"css": ".prod_author"},
+            "genre": {"css": ".prod_category"},
+            # data-src 속성이 있는 경우 우선 사용
+            "image_url": {"css": ".prod_thumb_box img", "attrs": ["data-src", "src"]},
+        },
+    },
+    "aladdin": {
+        "url": "https://www.aladin.co.kr/shop/common/wbest.aspx?BestType=Bestseller&BranchType=1&CID=0&cnt=20&SortOrder=1",
+        "category": "주간 베스트",
+        "item": "div.ss_book_box",
+        "image": "img.front_cover",
+        "network_idle": False,
+        "fields": {
+            "title": {"css": "a.bo3"},
+            # 저자 링크가 여러개일 수 있으므로 AuthorSearch 포함된 링크 활용
+            "author": {"css": "a[href*='AuthorSearch']"},
+            # 첫 번째 li 태그의 텍스트에서 카테고리 추출
+            "genre": {"css": "div.ss_book_list ul li"},
+            "image_url": {"css": "img.front_cover", "attrs": ["src"]},
+        },
+    },
+    "millie": {
+        "url": "https://www.millie.co.kr/v3/today/more/best/bookstore/total",
+        "category": "베스트셀러",
+        # v3 그리드 리스트 아이템 (SPA — 목록 렌더링 후 데이터 요청 종료까지 대기)
+        "item": "div.book-list li",
+        "image": "a.book-cover-link img",
+        "network_idle": True,
+        "fields": {
+            # Millie v3 메타데이터 (Title: 뒤에서 2번째 p, Author: 마지막 p)
+            "meta": {"css": "a.book-data p", "many": True},
+            "image_url": {"css": "a.book-cover-link img", "attrs": ["src"]},
+        },
+    },
+}
+
+_BULK_EXTRACT_JS = """
+const [spec, limit] = arguments;
+const text = el => (el.innerText || el.textContent || "").trim();
+return Array.from(document.querySelectorAll(spec.item)).slice(0, limit).map(item => {
+    const row = {};
+    for (const [name, field] of Object.entries(spec.fields)) {
+        if (field.many) {
+            row[name] = Array.from(item.querySelectorAll(field.css)).map(text);
+            continue;
+        }
+        const el = item.querySelector(field.css);
+        if (!el) { row[name] = null; continue; }
+        row[name] = field.attrs
+            ? (field.attrs.map(a => el.getAttribute(a)).find(v => v) || null)
+            : text(el);
+    }
+    return row;
+});
+"""
+
+
+def extract_rows_bulk(driver, spec: dict, limit: int) -> list[dict]:
+    """execute_script 한 번으로 상위 limit개 항목의 필드를 모두 추출."""
+    payload = {"item": spec["item"], "fields": spec["fields"]}
+    return driver.execute_script(_BULK_EXTRACT_JS, payload, limit) or []
+
+
+def extract_rows_element(driver, spec: dict, limit: int) -> list[dict]:
+    """항목/필드별 find_element 호출로 추출 (bulk와 동일한 row 형태)."""
+    rows = []
+    for item in driver.find_elements(By.CSS_SELECTOR, spec["item"])[:limit]:
+        row: dict = {}
+        for name, field in spec["fields"].items():
+            if field.get("many"):
+                row[name] = [el.text.strip() for el in item.find_elements(By.CSS_SELECTOR, field["css"])]
+                continue
+            try:
+                el = item.find_element(By.CSS_SELECTOR, field["css"])
+            except NoSuchElementException:
+                row[name] = None
+                continue
+            if field.get("attrs"):
+                row[name] = next((v for v in (el.get_attribute(a) for a in field["attrs"]) if v), None)
+            else:
+                row[name] = el.text.strip()
+        rows.append(row)
+    return rows
+
+
+def _soup_text(el) -> str:
+    return " ".join(el.get_text(" ").split())
+
+
+def extract_rows_html(html: str, spec: dict, limit: int) -> list[dict]:
+    """서버 렌더링 HTML을 lxml 파서로 읽어 bulk/element 모드와 같은 row 형태로 추출."""
+    soup = BeautifulSoup(html, "lxml")
+    rows = []
+    for item in soup.select(spec["item"], limit=limit):
+        row: dict = {}
+        for name, field in spec["fields"].items():
+            if field.get("many"):
+                row[name] = [_soup_text(el) for el in item.select(field["css"])]
+                continue
+            el = item.select_one(field["css"])
+            if el is None:
+                row[name] = None
+            elif field.get("attrs"):
+                row[name] = next((el.get(a) for a in field["attrs"] if el.get(a)), None)
+            else:
+                row[name] = _soup_text(el)
+        rows.append(row)
+    return rows
+
+
+# ── row → book dict 변환 ──────────────────────────────────────────────────────
+
+def _map_genre(text: Optional[str]) -> str:
+    if not text:
+        return "종합"
+    return GENRE_MAP.get(text, text)
+
+
+def _kyobo_row(row: dict) -> Optional[dict]:
+    if not row.get("title") or not row.get("author"):
+        return None
+    return {
+        "title": row["title"],
+        "author": row["author"].split(" ·")[0],   # 저자 정보 분리
+        "genre": _map_genre(row.get("genre")),
+        "image_url": row.get("image_url"),
+    }
+
+
+def _aladdin_row(row: dict) -> Optional[dict]:
+    if not row.get("title"):
+        return None
+    genre_text = row.get("genre") or ""
+    genre = genre_text.split("]")[0].replace("[", "") if "]" in genre_text else None
+    return {
+        "title": row["title"],
+        "author": row.get("author") or "저자 미상",
+        "genre": _map_genre(genre),
+        "image_url": row.get("image_url"),
+    }
+
+
+def _millie_row(row: dict) -> Optional[dict]:
+    meta = row.get("meta") or []
+    if len(meta) < 2:
+        return None
+    return {
+        "title": meta[-2],
+        "author": meta[-1],
+        "genre": "종합",
+        "image_url": row.get("image_url"),
+    }
+
+
+ROW_MAPPERS = {
+    "kyobo": _kyobo_row,
+    "aladdin": _aladdin_row,
+    "millie": _millie_row,
+}
+
+
+def rows_to_books(store: str, rows: list[dict]) -> list[dict]:
+    """추출 row를 _upsert_books 입력 형태로 변환. 순위는 목록상의 위치."""
+    spec = STORE_SPECS[store]
+    mapper = ROW_MAPPERS[store]
+    books = []
+    for rank, row in enumerate(rows, start=1):
+        book = mapper(row)
+        if book is None:
+            logger.debug(f"[{store}] item 파싱 실패: {row}")
+            continue
+        book.update({
+            "cover_color": STORE_COLORS[store],
+            "rank": rank,
+            "store": store,
+            "category": spec["category"],
+        })
+        books.append(book)
+    return books
@@ -0,0 +1,177 @@
+"""
+Page Readiness - 고정 sleep 대신 구체적인 조건을 짧게 폴링하며 대기
+- 상품 개수 도달 / 네트워크 idle (CDP performance log) / 이미지 src 채워짐
+- 모든 대기는 hard deadline을 가지며, 단계별 소요 시간은 PhaseTimer로 기록
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+ProgressCallback = Callable[[str, dict], None]
+
+
+class PhaseTimer:
+    """
+    크롤링 단계별 소요 시간(ms) 기록 — CrawlLog.phase_timings로 저장.
+    on_event가 있으면 단계 종료 / 진행 이벤트를 전달 (워커 스레드에서도 호출됨).
+    """
+
+    def __init__(self, on_event: Optional[ProgressCallback] = None):
+        self._created = time.perf_counter()
+        self.timings: dict[str, float] = {}
+        self.on_event = on_event
+
+    def emit(self, event: str, **data) -> None:
+        """진행 이벤트 전달 (page_loaded / items_parsed / rows_upserted ...)."""
+        if self.on_event is not None:
+            try:
+                self.on_event(event, data)
+            except Exception as e:
+                logger.debug(f"진행 이벤트 전달 실패: {e}")
+
+    def mark(self, name: str) -> None:
+        """생성 시점부터 지금까지의 시간을 기록 (예: 워커 슬롯 대기)."""
+        self.timings[name] = round((time.perf_counter() - self._created) * 1000, 1)
+        self.emit("phase", name=name, ms=self.timings[name])
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed, 1)
+            self.emit("phase", name=name, ms=round(elapsed, 1))
+
+
+def poll_until(
+    predicate: Callable[[], bool],
+    timeout: float,
+    interval: Optional[float] = None,
+) -> bool:
+    """predicate가 참이 될 때까지 interval 간격으로 폴링. deadline 초과 시 False."""
+    interval = interval or settings.CRAWL_POLL_INTERVAL_SECONDS
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if predicate():
+                return True
+        except WebDriverException as e:
+            logger.debug(f"readiness 조건 확인 실패: {e.__class__.__name__}")
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def count_elements(driver, selector: str) -> int:
+    return driver.execute_script(
+        "return document.querySelectorAll(arguments[0]).length", selector
+    )
+
+
+def wait_for_item_count(driver, selector: str, count: int, timeout: float) -> int:
+    """selector 매칭 요소가 count개 이상이 될 때까지 대기. 최종 개수 반환."""
+    found = [0]
+
+    def ready() -> bool:
+        found[0] = count_elements(driver, selector)
+        return found[0] >= count
+
+    if not poll_until(ready, timeout) and found[0]:
+        logger.debug(f"{selector}: {found[0]}/{count}개에서 deadline 도달")
+    return found[0]
+
+
+def drain_performance_log(driver) -> None:
+    """이전 페이지의 CDP 이벤트 버림 (네비게이션 직전에 호출)."""
+    try:
+        driver.get_log("performance")
+    except WebDriverException:
+        pass
+
+
+def wait_for_network_idle(
+    driver,
+    timeout: float,
+    idle_ms: Optional[int] = None,
+    max_inflight: int = 2,
+) -> bool:
+    """
+    CDP Network 이벤트(performance log)로 진행 중 요청 수를 추적,
+    max_inflight 이하가 idle_ms 동안 유지되면 idle로 판단 (long-poll 등 상시 연결 허용).
+    """
+    idle_ms = idle_ms if idle_ms is not None else settings.CRAWL_NETWORK_IDLE_MS
+    pending: set[str] = set()
+    quiet_since = [time.monotonic()]
+
+    def idle() -> bool:
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method", "")
+            request_id = message.get("params", {}).get("requestId")
+            if method == "Network.requestWillBeSent":
+                pending.add(request_id)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                pending.discard(request_id)
+        now = time.monotonic()
+        if len(pending) > max_inflight:
+            quiet_since[0] = now
+            return False
+        return (now - quiet_since[0]) * 1000 >= idle_ms
+
+    return poll_until(idle, timeout)
+
+
+# 뷰포트에 한 개씩 들여보내며 프레임마다 IntersectionObserver 기반 lazy-load 유도
+_TRIGGER_LAZY_LOAD_JS = """
+const [selector, limit, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+const items = Array.from(document.querySelectorAll(selector)).slice(0, limit);
+let i = 0;
+function step() {
+    if (i >= items.length) { window.scrollTo(0, 0); done(items.length); return; }
+    items[i++].scrollIntoView({block: "center"});
+    requestAnimationFrame(step);
+}
+step();
+"""
+
+_COUNT_LOADED_IMAGES_JS = """
+const [itemSelector, imgSelector, limit] = arguments;
+return Array.from(document.querySelectorAll(itemSelector)).slice(0, limit).filter(item => {
+    const img = item.querySelector(imgSelector);
+    if (!img) return true;   // 이미지 없는 항목은 대기 대상 아님
+    const src = img.getAttribute("data-src") || img.currentSrc || img.getAttribute("src") || "";
+    return src && !src.startsWith("data:");
+}).length;
+"""
+
+
+def trigger_lazy_load(driver, item_selector: str, limit: int) -> None:
+    """고정 sleep 스크롤 루프 대신 항목을 프레임 단위로 스크롤해 lazy 이미지 로드 유도."""
+    driver.set_script_timeout(settings.CRAWL_IMAGE_TIMEOUT_SECONDS)
+    driver.execute_async_script(_TRIGGER_LAZY_LOAD_JS, item_selector, limit)
+
+
+def wait_for_images(driver, item_selector: str, img_selector: str, count: int, timeout: float) -> int:
+    """상위 count개 항목의 이미지 src/data-src가 채워질 때까지 대기. 로드된 개수 반환."""
+    target = min(count, count_elements(driver, item_selector))
+    loaded = [0]
+
+    def ready() -> bool:
+        loaded[0] = driver.execute_script(
+            _COUNT_LOADED_IMAGES_JS, item_selector, img_selector, target
+        )
+        return loaded[0] >= target
+
+    poll_until(ready, timeout)
+    return loaded[0]
@@ -15,7 +15,7 @@ from sqlalchemy import func, select
 from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.models.book import Book
-from app.services.crawler_service import run_crawl
+from app.services.crawl_jobs import crawl_jobs
 
 logger = logging.getLogger(__name__)
 
@@ -26,17 +26,14 @@ scheduler = AsyncIOScheduler(timezone="Asia/Seoul")
 
 
 async def _crawl_all_stores() -> None:
-    """모든 서점 순차 크롤링 후 DB 저장 (내부 백그라운드 태스크)."""
+    """모든 서점 병렬 크롤링 후 DB 저장 (내부 백그라운드 태스크)."""
     logger.info("🕷️  [Scheduler] 주간 정기 크롤링 시작 (일->월 00:00)")
-    async with AsyncSessionLocal() as db:
-        for store in STORES:
-            try:
-                log = await run_crawl(store=store, db=db)
-                logger.info(
-                    f"✅ [{store}] 크롤링 완료 — {log.books_found}건 저장"
-                )
-            except Exception as e:
-                logger.error(f"❌ [{store}] 크롤링 실패: {e}")
+    # 수동 trigger와 같은 작업 큐 사용 — 이미 진행 중인 서점은 그 작업을 기다림
+    jobs = [crawl_jobs.submit(store)[0] for store in STORES]
+    for job in await asyncio.gather(*(crawl_jobs.wait(job) for job in jobs)):
+        logger.info(
+            f"✅ [{job.store}] 크롤링 {job.status} — {job.books_found}건 저장"
+        )
     logger.info("🕷️  [Scheduler] 주간 정기 크롤링 종료")
 
 
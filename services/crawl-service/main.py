@@ -1,8 +1,14 @@
 from fastapi import FastAPI
+from app.core.config import settings
 from app.routers import health_router, crawl_router
 from app.core.database import init_db
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
 from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.crawl_executor import executor
+from app.services.crawl_jobs import crawl_jobs
+from app.services.crawler_service import prewarm_drivers, close_fetchers
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -13,11 +19,18 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Crawl Service Starting")
     await init_db()
     await start_scheduler()
+    if settings.CRAWL_DRIVER_PREWARM:
+        asyncio.create_task(prewarm_drivers())
     yield
     stop_scheduler()
+    await crawl_jobs.stop()
+    await close_fetchers()
+    executor.shutdown()
     logger.info("🛑 Crawl Service Shutting Down")
 
 app = FastAPI(title="Crawl Service", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, service="crawl-service")
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 app.include_router(health_router)
 app.include_router(crawl_router)
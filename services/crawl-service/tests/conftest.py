@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# crawl-service 루트(app 패키지)를 import 경로에 추가 — 어느 디렉터리에서 pytest를 실행해도 동작
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
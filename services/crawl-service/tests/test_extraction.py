@@ -0,0 +1,110 @@
+"""
+서점별 저장 HTML fixture로 추출 경로(bulk / element / html)가 기존 서점별 매핑과 같은 결과를 내는지 확인.
+셀렉터가 Selenium 경로와 BeautifulSoup 경로 사이에서 어긋나는 것을 막는 회귀 테스트.
+bulk / element 테스트는 headless Chrome이 있을 때만 실행 (없으면 skip).
+
+실행 (crawl-service 디렉터리에서):
+    python -m pytest tests
+"""
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.services.extraction import (
+    STORE_COLORS,
+    STORE_SPECS,
+    extract_rows_bulk,
+    extract_rows_element,
+    extract_rows_html,
+    rows_to_books,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LIMIT = 20
+
+
+def _book(store: str, rank: int, title: str, author: str, genre: str, image_url):
+    return {
+        "title": title,
+        "author": author,
+        "genre": genre,
+        "image_url": image_url,
+        "cover_color": STORE_COLORS[store],
+        "rank": rank,
+        "store": store,
+        "category": STORE_SPECS[store]["category"],
+    }
+
+
+# 리팩터링 전 서점별 크롤러(_crawl_<store>_sync)가 fixture에서 만들던 결과
+# - 저자 없는 교보 항목 / 메타가 2개 미만인 밀리 항목은 건너뛰되 순위는 목록상 위치 유지
+EXPECTED = {
+    "kyobo": [
+        _book("kyobo", 1, "불편한 편의점", "김호연", "소설",
+              "https://contents.kyobobook.co.kr/pdt/9791161571188.jpg"),
+        _book("kyobo", 3, "역행자", "자청", "경제/경영",
+              "https://contents.kyobobook.co.kr/pdt/9788901272580.jpg"),
+        _book("kyobo", 4, "세이노의 가르침", "세이노", "종합", None),
+    ],
+    "aladdin": [
+        _book("aladdin", 1, "부자 아빠 가난한 아빠", "로버트 기요사키", "경제/경영",
+              "https://image.aladin.co.kr/product/1/cover.jpg"),
+        _book("aladdin", 2, "모순", "저자 미상", "종합",
+              "https://image.aladin.co.kr/product/2/cover.jpg"),
+        _book("aladdin", 3, "소년이 온다", "한강", "소설", None),
+    ],
+    "millie": [
+        _book("millie", 1, "도둑맞은 집중력", "요한 하리", "종합",
+              "https://cover.millie.co.kr/service/cover/1.jpg"),
+        _book("millie", 3, "트렌드 코리아 2025", "김난도", "종합", None),
+    ],
+}
+
+STORES = sorted(EXPECTED)
+
+
+def _fixture(store: str) -> Path:
+    return FIXTURES / f"{store}.html"
+
+
+@pytest.mark.parametrize("store", STORES)
+def test_html_extraction_matches_baseline(store):
+    rows = extract_rows_html(_fixture(store).read_text(encoding="utf-8"), STORE_SPECS[store], LIMIT)
+    assert rows_to_books(store, rows) == EXPECTED[store]
+
+
+def test_html_extraction_respects_limit():
+    rows = extract_rows_html(_fixture("kyobo").read_text(encoding="utf-8"), STORE_SPECS["kyobo"], 1)
+    assert len(rows) == 1
+
+
+# ── 브라우저 경로 (bulk / element) ───────────────────────────────────────────
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+
+
+@pytest.fixture(scope="module")
+def driver():
+    if not any(shutil.which(name) for name in CHROME_BINARIES):
+        pytest.skip("headless Chrome 없음 — bulk / element 추출 테스트 생략")
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    opts = Options()
+    opts.add_argument("--headless=new")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    chrome = webdriver.Chrome(options=opts)
+    yield chrome
+    chrome.quit()
+
+
+@pytest.mark.parametrize("extract", [extract_rows_bulk, extract_rows_element], ids=["bulk", "element"])
+@pytest.mark.parametrize("store", STORES)
+def test_browser_extraction_matches_html(driver, store, extract):
+    spec = STORE_SPECS[store]
+    driver.get(_fixture(store).resolve().as_uri())
+    rows = extract(driver, spec, LIMIT)
+    assert rows == extract_rows_html(_fixture(store).read_text(encoding="utf-8"), spec, LIMIT)
+    assert rows_to_books(store, rows) == EXPECTED[store]
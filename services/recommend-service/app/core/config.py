@@ -24,6 +24,29 @@ class Settings(BaseSettings):
     # Google Gemini LLM
     GOOGLE_API_KEY: str = ""
     GOOGLE_MODEL_NAME: str = "gemini-2.0-flash"
+    LLM_CLIENT_CACHE_SIZE: int = 32               # (API 키, 모델)별 재사용 클라이언트 최대 수
+
+    # LLM admission control
+    LLM_MAX_CONCURRENCY: int = 4                  # 동시에 실행할 Gemini 스트림 수
+    LLM_QUEUE_MAX_SIZE: int = 64                  # 대기열 최대 길이 (초과 시 503)
+    LLM_QUEUE_MAX_WAIT_SECONDS: float = 30        # 예상/실제 대기 시간 상한
+    LLM_GENERATION_ESTIMATE_SECONDS: float = 8    # 생성 시간 초기 추정치 (이후 이동 평균)
+
+    # Bestseller context cache
+    CONTEXT_CACHE_TTL_SECONDS: float = 3600       # 버전 변경이 없어도 이 주기로 재구성
+    CONTEXT_POLL_INTERVAL_SECONDS: float = 30     # 최신 크롤링 완료(CrawlLog) 확인 주기
+    BESTSELLER_CONTEXT_LIMIT: int = 60            # 후보 풀 (서점별 현재 베스트셀러 전체)
+
+    # Prompt budget
+    PROMPT_CONTEXT_TOKEN_BUDGET: int = 1200       # 후보 표에 쓸 추정 토큰 상한
+    PROMPT_MAX_CANDIDATES: int = 30               # 예산과 별개로 표에 넣을 최대 후보 수
+
+    # Recommendation response cache
+    RECOMMEND_CACHE_TTL_SECONDS: float = 86400
+    RECOMMEND_CACHE_MAX_ENTRIES: int = 512
+    RECOMMEND_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RECOMMEND_CACHE_SIMILARITY: float = 0.0       # 근사 일치 코사인 임계값 (0이면 정확 일치만, 켤 때는 0.9 이상 권장)
+    RECOMMEND_CACHE_REPLAY_DELAY_MS: float = 15   # 재생 시 text 청크 간격
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,129 @@
+"""
+Schema Migrations - create_all 이후 적용되는 버전 관리형 스키마 변경
+- 적용된 버전은 schema_migrations 테이블에 기록 (한 번만 실행)
+- 세 서비스가 같은 DB를 공유하므로 advisory lock으로 동시 기동 시 직렬화
+- PostgreSQL 전용 (SQLite 등은 create_all이 모델 기준 스키마를 그대로 생성)
+"""
+import logging
+from typing import Awaitable, Callable, Union
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.search_key import book_search_key
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock 키 (임의의 고정 값, 트랜잭션 종료 시 자동 해제)
+MIGRATION_LOCK_KEY = 720_240_001
+
+# 0003 시점의 조회 경로별 인덱스 (이후 변경은 새 마이그레이션으로 추가)
+HOT_QUERY_INDEXES: dict[str, str] = {
+    # get_books: ORDER BY crawled_at DESC
+    "ix_books_crawled_at": "CREATE INDEX IF NOT EXISTS ix_books_crawled_at ON books (crawled_at)",
+    "ix_books_genre": "CREATE INDEX IF NOT EXISTS ix_books_genre ON books (genre)",
+    "ix_books_author": "CREATE INDEX IF NOT EXISTS ix_books_author ON books (author)",
+    # selectinload(Book.rankings): WHERE book_id IN (...)
+    "ix_book_rankings_book_id": "CREATE INDEX IF NOT EXISTS ix_book_rankings_book_id ON book_rankings (book_id)",
+    # get_books(store=...): JOIN ... WHERE store = :store
+    "ix_book_rankings_store_book_id": "CREATE INDEX IF NOT EXISTS ix_book_rankings_store_book_id ON book_rankings (store, book_id)",
+    # get_bestseller_context: ORDER BY rank
+    "ix_book_rankings_rank": "CREATE INDEX IF NOT EXISTS ix_book_rankings_rank ON book_rankings (rank)",
+    # 서점별 최신 랭킹 (max(rank_date))
+    "ix_book_rankings_store_rank_date": "CREATE INDEX IF NOT EXISTS ix_book_rankings_store_rank_date ON book_rankings (store, rank_date)",
+}
+
+
+async def _backfill_search_keys(conn: AsyncConnection) -> None:
+    """search_key가 비어 있는 기존 도서에 정규화 키 채우기 (정규화는 Python 구현과 동일해야 함)."""
+    result = await conn.execute(text("SELECT id, title, author FROM books WHERE search_key IS NULL"))
+    params = [{"id": row.id, "key": book_search_key(row.title, row.author)} for row in result]
+    if params:
+        await conn.execute(text("UPDATE books SET search_key = :key WHERE id = :id"), params)
+
+
+# SQL 문자열 또는 conn을 받는 코루틴 함수
+Step = Union[str, Callable[[AsyncConnection], Awaitable[None]]]
+
+# (버전, 단계 목록) — 추가만 하고 기존 항목은 수정하지 않음
+MIGRATIONS: list[tuple[str, list[Step]]] = [
+    ("0001_crawl_logs_phase_timings", [
+        "ALTER TABLE crawl_logs ADD COLUMN IF NOT EXISTS phase_timings JSON",
+    ]),
+    # (title, author) 중복 도서 병합 후 unique 인덱스 생성 — 랭킹은 가장 오래된 id로 이전
+    ("0002_books_unique_title_author", [
+        """
+        UPDATE book_rankings r SET book_id = d.keep_id
+        FROM (SELECT id, min(id) OVER (PARTITION BY title, author) AS keep_id FROM books) d
+        WHERE r.book_id = d.id AND d.id <> d.keep_id
+        """,
+        """
+        DELETE FROM books b
+        USING (SELECT id, min(id) OVER (PARTITION BY title, author) AS keep_id FROM books) d
+        WHERE b.id = d.id AND d.id <> d.keep_id
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_books_title_author ON books (title, author)",
+    ]),
+    ("0003_hot_query_indexes", list(HOT_QUERY_INDEXES.values()) + [
+        "ANALYZE books",
+        "ANALYZE book_rankings",
+    ]),
+    # 검색: 정규화 키 + trigram GIN (LIKE '%q%' / word_similarity 모두 인덱스 사용)
+    ("0004_books_search_key_trgm", [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "ALTER TABLE books ADD COLUMN IF NOT EXISTS search_key TEXT",
+        _backfill_search_keys,
+        "CREATE INDEX IF NOT EXISTS ix_books_search_key_trgm ON books USING gin (search_key gin_trgm_ops)",
+    ]),
+    # 목록 keyset 페이지네이션 정렬과 동일한 복합 인덱스로 단일 컬럼 인덱스 대체
+    ("0005_books_crawled_at_id", [
+        "CREATE INDEX IF NOT EXISTS ix_books_crawled_at_id ON books (crawled_at DESC NULLS LAST, id DESC)",
+        "DROP INDEX IF EXISTS ix_books_crawled_at",
+    ]),
+    # current_bestsellers(create_all로 생성)를 서점별 최신 rank_date 랭킹으로 초기 채움
+    ("0006_current_bestsellers_backfill", [
+        """
+        INSERT INTO current_bestsellers (book_id, store, category, rank, rank_date)
+        SELECT r.book_id, r.store, r.category, min(r.rank), r.rank_date
+        FROM book_rankings r
+        JOIN (SELECT store, max(rank_date) AS rank_date FROM book_rankings GROUP BY store) latest
+          ON latest.store = r.store AND latest.rank_date = r.rank_date
+        WHERE NOT EXISTS (SELECT 1 FROM current_bestsellers c WHERE c.store = r.store)
+        GROUP BY r.book_id, r.store, r.category, r.rank_date
+        """,
+    ]),
+]
+
+
+async def lock_schema(conn: AsyncConnection) -> None:
+    """트랜잭션 종료까지 다른 서비스의 create_all / 마이그레이션을 대기시킴."""
+    if conn.dialect.name == "postgresql":
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+async def run_migrations(conn: AsyncConnection) -> None:
+    """미적용 마이그레이션을 순서대로 실행. init_db의 트랜잭션 안에서 lock_schema 이후 호출."""
+    if conn.dialect.name != "postgresql":
+        return
+
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version VARCHAR(100) PRIMARY KEY,"
+        " applied_at TIMESTAMP NOT NULL DEFAULT now())"
+    ))
+    result = await conn.execute(text("SELECT version FROM schema_migrations"))
+    applied = set(result.scalars().all())
+
+    for version, steps in MIGRATIONS:
+        if version in applied:
+            continue
+        for step in steps:
+            if callable(step):
+                await step(conn)
+            else:
+                await conn.execute(text(step))
+        await conn.execute(
+            text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+            {"version": version},
+        )
+        logger.info(f"🗂️ Migration applied: {version}")
@@ -1,41 +1,120 @@
-from fastapi import APIRouter, Depends
+import hashlib
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.config import settings
 from app.schemas.book import RecommendRequest
-from app.services import book_service, llm_service
+from app.services import llm_service
+from app.services.admission import AdmissionRejected, admission
+from app.services.coalescer import coalescer
+from app.services.context_builder import build_prompt_context
+from app.services.context_cache import context_cache
+from app.services.recommendation_cache import recommendation_cache
 
 router = APIRouter(prefix="/api/recommend", tags=["recommend"])
 
 
+def _key_hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _client_id(http_request: Request, api_key: Optional[str]) -> str:
+    """공정 대기열용 클라이언트 식별자 — 개인 API 키가 있으면 키 해시, 없으면 요청 IP."""
+    if api_key:
+        return "key:" + _key_hash(api_key)
+    forwarded = http_request.headers.get("x-forwarded-for")
+    if forwarded:
+        return "ip:" + forwarded.split(",")[0].strip()
+    return "ip:" + (http_request.client.host if http_request.client else "unknown")
+
+
 @router.post("")
-async def recommend(
-    request: RecommendRequest,
-    db: AsyncSession = Depends(get_db),
-):
+async def recommend(request: RecommendRequest, http_request: Request):
     """
     LLM 스트리밍 도서 추천.
     응답은 JSON Lines (newline-delimited JSON) 형식:
+      {"type": "queued",  "data": {"position": 1, "eta_seconds": 8}}  (LLM 대기열에 있을 때)
       {"type": "text",    "data": "..."}
       {"type": "books",   "data": [...]}
       {"type": "sources", "data": [...]}
       {"type": "done",    "data": null}
     """
-    # DB 베스트셀러 컨텍스트 생성
-    books_context = await book_service.get_bestseller_context(db, limit=30)
-
-    async def event_generator():
-        async for chunk in llm_service.stream_recommendation(
-            query=request.query,
-            books_context=books_context,
-            max_books=request.max_books,
-            api_key=request.google_api_key,
-        ):
-            yield chunk
+    # 캐시된 베스트셀러 컨텍스트 (크롤링 완료 시 폴러가 갱신 — 요청 경로 DB 접근 없음)
+    context = await context_cache.get()
+
+    # 같은 컨텍스트 버전에서 (근사) 동일 질의는 저장된 스트림 재생
+    cache_key = recommendation_cache.make_key(
+        request.query, request.max_books, settings.GOOGLE_MODEL_NAME, context.version
+    )
+    cached, cache_status = recommendation_cache.lookup(cache_key)
+
+    if cached is not None:
+        stream = recommendation_cache.replay(cached)
+    else:
+        # 동일 키로 진행 중인 LLM 스트림이 있으면 합류 (업스트림 호출은 하나)
+        # 개인 API 키 요청은 같은 키끼리만 병합 — 다른 사용자 키로 과금 / 오류가 전파되지 않도록
+        flight_key = cache_key.exact
+        if request.google_api_key:
+            flight_key += ":key:" + _key_hash(request.google_api_key)
+        # 새 스트림을 시작해야 할 때만 LLM 대기열 수용 여부 확인
+        reservation = None
+        if not coalescer.has(flight_key):
+            try:
+                reservation = admission.check()
+            except AdmissionRejected as e:
+                raise HTTPException(
+                    status_code=503,
+                    detail=str(e),
+                    headers={"Retry-After": str(e.retry_after)},
+                )
+        client = _client_id(http_request, request.google_api_key)
+        stream, joined = coalescer.subscribe(
+            flight_key,
+            lambda: recommendation_cache.record(
+                cache_key,
+                admission.run(
+                    client,
+                    reservation,
+                    lambda: llm_service.stream_recommendation(
+                        query=request.query,
+                        prompt_context=build_prompt_context(request.query, context.books, request.max_books),
+                        max_books=request.max_books,
+                        api_key=request.google_api_key,
+                    ),
+                ),
+            ),
+        )
+        if joined:
+            cache_status = "COALESCED"
 
     return StreamingResponse(
-        event_generator(),
+        stream,
         media_type="application/x-ndjson",
-        headers={"X-Content-Type-Options": "nosniff"},
+        headers={"X-Content-Type-Options": "nosniff", "X-Cache": cache_status},
     )
+
+
+@router.get("/context")
+async def context_status():
+    """베스트셀러 컨텍스트 캐시 상태 (버전 / 도서 수 / 경과 시간)."""
+    return context_cache.stats()
+
+
+@router.get("/cache")
+async def cache_status():
+    """추천 응답 캐시 통계 (적중률 / 항목 수 / 바이트)."""
+    return recommendation_cache.stats()
+
+
+@router.get("/inflight")
+async def inflight_status():
+    """진행 중인 (병합된) LLM 스트림 통계."""
+    return coalescer.stats()
+
+
+@router.get("/admission")
+async def admission_status():
+    """LLM 동시 실행 / 대기열 상태와 대기 시간 vs 생성 시간 분포."""
+    return admission.stats()
@@ -1,7 +1,17 @@
 from app.services.llm_service import stream_recommendation
-from app.services.book_service import get_bestseller_context
+from app.services.book_service import get_bestseller_context, load_bestseller_books, format_bestseller_context
+from app.services.admission import admission
+from app.services.coalescer import coalescer
+from app.services.context_cache import context_cache
+from app.services.recommendation_cache import recommendation_cache
 
 __all__ = [
     "stream_recommendation",
     "get_bestseller_context",
+    "load_bestseller_books",
+    "format_bestseller_context",
+    "admission",
+    "coalescer",
+    "context_cache",
+    "recommendation_cache",
 ]
@@ -0,0 +1,257 @@
+"""
+Admission Control - LLM 동시 호출 상한 + 공정 대기열
+- 동시에 실행되는 Gemini 스트림을 LLM_MAX_CONCURRENCY 개로 제한
+- 대기열은 클라이언트별 가상 시간(start-time fair queuing) 순 → 한 클라이언트의 폭주가 다른 클라이언트를 굶기지 않음
+- 대기 중에는 순번 / 예상 대기 시간을 queued 청크로 알림 (순번이 바뀔 때마다)
+- 예상 대기 시간이 데드라인을 넘거나 대기열이 가득 차면 즉시 거절 (라우터에서 503 + Retry-After)
+  check()가 자리를 예약(Reservation)하고 run()이 그 예약을 소비 → 같은 tick에 몰린 요청도 상한 초과 불가
+- 대기 시간 / 생성 시간 분포 집계
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import math
+import time
+from collections import deque
+from typing import AsyncGenerator, AsyncIterator, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """대기열 포화 — retry_after 초 뒤 재시도 권장."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Timing:
+    """최근 표본 기반 소요 시간 분포."""
+
+    def __init__(self, window: int = 256):
+        self.count = 0
+        self.total = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self._recent.append(seconds)
+
+    def stats(self) -> dict:
+        recent = sorted(self._recent)
+
+        def pct(p: float):
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))], 3) if recent else None
+
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else None,
+            "p50": pct(0.5),
+            "p95": pct(0.95),
+        }
+
+
+class _Waiter:
+    __slots__ = ("client", "tag", "seq", "granted", "event")
+
+    def __init__(self, client: str, tag: float, seq: int):
+        self.client = client
+        self.tag = tag
+        self.seq = seq
+        self.granted = False
+        self.event = asyncio.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.tag, self.seq) < (other.tag, other.seq)
+
+
+class Reservation:
+    """check()가 잡아 둔 실행 / 대기 자리 — run()이 소비하거나 release()로 반납."""
+
+    __slots__ = ("_controller", "held")
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self.held = True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self._controller._reserved -= 1
+
+
+def _queued_chunk(position: int, eta_seconds: int) -> str:
+    data = {"position": position, "eta_seconds": eta_seconds}
+    return json.dumps({"type": "queued", "data": data}, ensure_ascii=False) + "\n"
+
+
+class AdmissionController:
+    """동시 실행 슬롯 + 클라이언트 공정 대기열."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait_seconds: float,
+        generation_estimate_seconds: float,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+
+        self._active = 0
+        self._reserved = 0      # check() 통과 후 아직 run()에 도달하지 않은 요청
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._client_tags: dict[str, float] = {}
+        # 생성 시간 이동 평균 — ETA 계산용
+        self._generation_avg = generation_estimate_seconds
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.queue_wait = _Timing()
+        self.generation = _Timing()
+
+    def estimate_wait(self, position: int) -> float:
+        """대기열 position 번째 요청의 예상 대기 시간(초)."""
+        if position <= 0:
+            return 0.0
+        return math.ceil(position / self.max_concurrency) * self._generation_avg
+
+    def check(self) -> Reservation:
+        """
+        새 요청을 받을 수 있는지 확인하고 자리를 예약. 불가하면 AdmissionRejected.
+        예약된 요청도 실행 / 대기 중인 것으로 세므로 같은 tick의 요청 폭주도 max_queue를 넘지 못함.
+        """
+        demand = self._active + len(self._queue) + self._reserved
+        waiting = demand - self.max_concurrency
+        if waiting >= 0:
+            eta = self.estimate_wait(waiting + 1)
+            if waiting >= self.max_queue or eta > self.max_wait_seconds:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    f"추천 요청이 많아 대기열이 가득 찼습니다. (대기 {waiting}건, 예상 {eta:.0f}초)",
+                    retry_after=max(1, math.ceil(self._generation_avg)),
+                )
+        self._reserved += 1
+        return Reservation(self)
+
+    def _position(self, waiter: _Waiter) -> int:
+        return 1 + sum(1 for other in self._queue if other < waiter)
+
+    def _enqueue(self, client: str) -> _Waiter:
+        # 클라이언트별 가상 시작 시간: 직전 요청 태그 이후, 전역 가상 시간 이후
+        tag = max(self._virtual_time, self._client_tags.get(client, 0.0)) + 1.0
+        self._client_tags[client] = tag
+        waiter = _Waiter(client, tag, next(self._seq))
+        heapq.heappush(self._queue, waiter)
+        return waiter
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        self._queue.remove(waiter)
+        heapq.heapify(self._queue)
+        for other in self._queue:
+            other.event.set()
+
+    def _release(self) -> None:
+        self._active -= 1
+        while self._queue and self._active < self.max_concurrency:
+            waiter = heapq.heappop(self._queue)
+            self._virtual_time = waiter.tag
+            waiter.granted = True
+            self._active += 1
+            waiter.event.set()
+        # 남은 대기자에게 순번 변경 알림
+        for waiter in self._queue:
+            waiter.event.set()
+        if not self._queue:
+            self._client_tags.clear()
+
+    async def run(
+        self,
+        client: str,
+        reservation: Reservation,
+        start: Callable[[], AsyncIterator[str]],
+    ) -> AsyncGenerator[str, None]:
+        """check()의 예약을 소비해 슬롯을 얻을 때까지 queued 청크를 내보내며 대기한 뒤 start() 스트림을 전달."""
+        reservation.release()
+        enqueued_at = time.monotonic()
+        if self._active < self.max_concurrency and not self._queue:
+            self._active += 1
+        else:
+            waiter = self._enqueue(client)
+            proceed = False
+            try:
+                last_position = None
+                while not waiter.granted:
+                    position = self._position(waiter)
+                    if position != last_position:
+                        last_position = position
+                        yield _queued_chunk(position, math.ceil(self.estimate_wait(position)))
+                    remaining = enqueued_at + self.max_wait_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    waiter.event.clear()
+                    try:
+                        await asyncio.wait_for(waiter.event.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                proceed = waiter.granted
+            finally:
+                if not waiter.granted:
+                    self._dequeue(waiter)
+                elif not proceed:
+                    # 슬롯을 받은 직후 구독이 끊긴 경우 — 다음 대기자에게 넘김
+                    self._release()
+            if not waiter.granted:
+                self.timed_out += 1
+                logger.warning(f"⏳ LLM 대기 시간 초과 client={client}")
+                yield json.dumps(
+                    {"type": "error", "data": "추천 요청이 많아 대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."},
+                    ensure_ascii=False,
+                ) + "\n"
+                return
+
+        self.admitted += 1
+        started = time.monotonic()
+        self.queue_wait.observe(started - enqueued_at)
+        try:
+            async for chunk in start():
+                yield chunk
+        finally:
+            elapsed = time.monotonic() - started
+            self.generation.observe(elapsed)
+            self._generation_avg = 0.8 * self._generation_avg + 0.2 * elapsed
+            self._release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": len(self._queue),
+            "reserved": self._reserved,
+            "max_queue": self.max_queue,
+            "max_wait_seconds": self.max_wait_seconds,
+            "generation_estimate_seconds": round(self._generation_avg, 3),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "queue_wait_seconds": self.queue_wait.stats(),
+            "generation_seconds": self.generation.stats(),
+        }
+
+
+admission = AdmissionController(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_queue=settings.LLM_QUEUE_MAX_SIZE,
+    max_wait_seconds=settings.LLM_QUEUE_MAX_WAIT_SECONDS,
+    generation_estimate_seconds=settings.LLM_GENERATION_ESTIMATE_SECONDS,
+)
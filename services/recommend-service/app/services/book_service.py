@@ -9,7 +9,7 @@ from sqlalchemy import select, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.book import Book, BookRanking
+from app.models.book import Book, BookRanking, CurrentBestseller
 
 logger = logging.getLogger(__name__)
 
@@ -45,38 +45,61 @@ async def get_book_by_id(db: AsyncSession, book_id: int) -> Optional[Book]:
     return result.scalars().first()
 
 
-async def get_bestseller_context(db: AsyncSession, limit: int = 30) -> str:
+async def load_bestseller_books(db: AsyncSession, limit: int = 30) -> list[dict]:
     """
-    LLM 프롬프트용 베스트셀러 컨텍스트 문자열 생성.
-    각 서점 상위 도서를 정형화된 텍스트로 반환.
+    current_bestsellers 스냅샷(서점별 최신 랭킹)을 최고 순위가 높은 도서부터 limit권 읽어
+    프론트엔드 BookData 형태의 dict 목록으로 반환 (rankings: {store: rank}, categories: {store: category}).
     """
-    # 최신 랭킹 기준 상위 도서
     result = await db.execute(
-        select(Book)
-        .options(selectinload(Book.rankings))
-        .join(Book.rankings)
-        .order_by(BookRanking.rank)
-        .limit(limit)
+        select(CurrentBestseller, Book)
+        .join(Book, Book.id == CurrentBestseller.book_id)
+        .order_by(CurrentBestseller.rank, CurrentBestseller.store)
     )
-    books = list(result.scalars().unique().all())
 
+    books: dict[int, dict] = {}
+    for entry, book in result.all():
+        record = books.get(book.id)
+        if record is None:
+            record = books[book.id] = {
+                "id": str(book.id),
+                "title": book.title,
+                "author": book.author,
+                "genre": book.genre,
+                "rating": book.rating,
+                "description": book.description,
+                "cover_color": book.cover_color,
+                "image_url": book.image_url,
+                "rankings": {},
+                "categories": {},
+                "crawled_at": book.crawled_at.isoformat() if book.crawled_at else None,
+            }
+        record["rankings"].setdefault(entry.store, entry.rank)
+        record["categories"].setdefault(entry.store, entry.category)
+    return list(books.values())[:limit]
+
+
+def format_bestseller_context(books: list[dict]) -> str:
+    """LLM 프롬프트용 베스트셀러 컨텍스트 문자열 (도서당 한 줄)."""
     if not books:
         return "현재 베스트셀러 데이터가 없습니다. (크롤링 필요)"
 
     lines = []
     for book in books:
-        store_ranks = ", ".join(
-            f"{r.store} {r.rank}위" for r in book.rankings
-        )
-        desc = book.description[:60] + "..." if book.description and len(book.description) > 60 else (book.description or "")
+        store_ranks = ", ".join(f"{store} {rank}위" for store, rank in book["rankings"].items())
+        description = book["description"] or ""
+        desc = description[:60] + "..." if len(description) > 60 else description
         lines.append(
-            f"- [{book.genre or '종합'}] {book.title} / {book.author} "
-            f"| 평점: {book.rating or 'N/A'} | {store_ranks} | {desc}"
+            f"- [{book['genre'] or '종합'}] {book['title']} / {book['author']} "
+            f"| 평점: {book['rating'] or 'N/A'} | {store_ranks} | {desc}"
         )
-
     return "\n".join(lines)
 
 
+async def get_bestseller_context(db: AsyncSession, limit: int = 30) -> str:
+    """LLM 프롬프트용 베스트셀러 컨텍스트 문자열 생성 (요청 경로에서는 context_cache 사용)."""
+    return format_bestseller_context(await load_bestseller_books(db, limit))
+
+
 async def search_books(db: AsyncSession, query: str, limit: int = 20) -> list[Book]:
     """제목/저자 키워드 검색."""
     result = await db.execute(
@@ -0,0 +1,142 @@
+"""
+Stream Coalescer - 동일 추천 질의의 동시 요청 병합 (single-flight)
+- 키(정규화 질의 + max_books + 모델 + 컨텍스트 버전)별로 업스트림 스트림은 하나만 실행
+- 뒤이어 온 요청은 같은 청크 열을 처음부터 재생(replay 버퍼)한 뒤 실시간으로 이어 받음
+- 진행 상태 청크(queued 등)는 재생 버퍼에 넣지 않고 최신 값 하나만 유지 → 새 구독자에게 지난 순번을 보내지 않음
+- 업스트림은 백그라운드 태스크가 소비 → 구독자 하나가 끊겨도 다른 구독자 / 캐시 저장에 영향 없음
+- 스트림 종료 시 항목 제거 (이후 요청은 응답 캐시가 처리)
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncGenerator, AsyncIterator, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """진행 중인 업스트림 스트림 하나와 지금까지 받은 청크."""
+
+    __slots__ = ("key", "chunks", "status", "status_seq", "finished", "subscribers", "task", "_changed")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.chunks: list[str] = []
+        self.status: Optional[str] = None     # 최신 진행 상태 청크 (본문이 시작되면 None)
+        self.status_seq = 0
+        self.finished = False
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        # 대기 중인 구독자를 깨우고 다음 대기용 이벤트로 교체
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def append(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self.status = None
+        self._notify()
+
+    def set_status(self, chunk: str) -> None:
+        self.status = chunk
+        self.status_seq += 1
+        self._notify()
+
+    def finish(self) -> None:
+        self.finished = True
+        self._notify()
+
+    async def wait(self, cursor: int, status_seq: int) -> None:
+        while (
+            cursor >= len(self.chunks)
+            and (self.status is None or status_seq == self.status_seq)
+            and not self.finished
+        ):
+            await self._changed.wait()
+
+
+class StreamCoalescer:
+    """키별 단일 업스트림 + 구독자별 독립 커서."""
+
+    def __init__(self, transient_types: frozenset[str] = frozenset()):
+        self.transient_types = transient_types
+        self._flights: dict[str, _Flight] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def has(self, key: str) -> bool:
+        return key in self._flights
+
+    def subscribe(
+        self,
+        key: str,
+        start: Callable[[], AsyncIterator[str]],
+    ) -> tuple[AsyncGenerator[str, None], bool]:
+        """
+        key의 스트림 구독. 진행 중인 스트림이 없으면 start()로 업스트림을 시작.
+        반환: (구독 스트림, 기존 스트림에 합류했는지 여부)
+        """
+        flight = self._flights.get(key)
+        joined = flight is not None
+        if joined:
+            self.followers += 1
+        else:
+            self.leaders += 1
+            flight = _Flight(key)
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._run(flight, start()))
+        return self._follow(flight), joined
+
+    async def _run(self, flight: _Flight, stream: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in stream:
+                if self.transient_types and json.loads(chunk).get("type") in self.transient_types:
+                    flight.set_status(chunk)
+                else:
+                    flight.append(chunk)
+        except Exception as e:
+            logger.error(f"병합 스트림 업스트림 오류: {e}")
+            flight.append(json.dumps({"type": "error", "data": str(e)}, ensure_ascii=False) + "\n")
+        finally:
+            flight.finish()
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+
+    async def _follow(self, flight: _Flight) -> AsyncGenerator[str, None]:
+        flight.subscribers += 1
+        cursor = 0
+        status_seq = 0
+        try:
+            while True:
+                if cursor < len(flight.chunks):
+                    chunk = flight.chunks[cursor]
+                    cursor += 1
+                    yield chunk
+                elif flight.finished:
+                    return
+                elif flight.status is not None and status_seq != flight.status_seq:
+                    status_seq = flight.status_seq
+                    yield flight.status
+                else:
+                    await flight.wait(cursor, status_seq)
+        finally:
+            flight.subscribers -= 1
+
+    async def stop(self) -> None:
+        for flight in list(self._flights.values()):
+            if flight.task is not None:
+                flight.task.cancel()
+        self._flights.clear()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "subscribers": sum(f.subscribers for f in self._flights.values()),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+
+coalescer = StreamCoalescer(transient_types=frozenset({"queued"}))
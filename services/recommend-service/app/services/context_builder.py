@@ -0,0 +1,127 @@
+"""
+Context Builder - 추천 프롬프트용 후보 도서 선별 + 압축 표 인코딩
+- 질의의 장르 키워드 / 문자 bigram 겹침 / 현재 순위로 후보를 점수화 (로컬 경량 랭커)
+- 후보는 짧은 id(b1, b2 ...)를 붙인 "|" 구분 표로 인코딩, 토큰 예산을 넘지 않을 때까지만 포함
+- LLM은 id만 반환하고, 서비스가 id를 캐시된 도서 레코드로 확장
+"""
+import math
+import unicodedata
+from typing import Optional
+
+from app.core.config import settings
+from app.services.recommendation_cache import normalize_query
+
+# 질의 키워드 → 크롤러 장르명 (crawl-service extraction.GENRE_MAP 기준)
+GENRE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "소설": ("소설", "장편", "단편", "추리", "미스터리", "스릴러", "판타지", "sf", "로맨스", "연애"),
+    "자기계발": ("자기계발", "성장", "습관", "동기부여", "성공", "생산성", "공부법"),
+    "경제/경영": ("경제", "경영", "투자", "주식", "재테크", "부동산", "돈", "마케팅", "창업", "비즈니스"),
+    "역사/문화": ("역사", "문화", "인문", "철학", "세계사", "한국사"),
+    "과학": ("과학", "물리", "생물", "우주", "뇌", "수학", "기술"),
+    "에세이": ("에세이", "산문", "위로", "힐링", "일상"),
+    "시/에세이": ("시집", "시인", "시"),
+    "아동": ("아동", "어린이", "동화", "그림책", "아이"),
+    "청소년": ("청소년", "10대", "학생"),
+}
+
+TABLE_HEADER = "id|제목|저자|장르|평점|순위|소개"
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사 — ASCII 4자당 1토큰, 그 외(한글 등) 1자당 1토큰."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def _bigrams(text: str) -> set[str]:
+    compact = "".join(ch for ch in unicodedata.normalize("NFKC", text or "").lower() if ch.isalnum())
+    return {compact[i:i + 2] for i in range(len(compact) - 1)} or ({compact} if compact else set())
+
+
+def query_genres(query: str) -> set[str]:
+    """질의에 포함된 장르 키워드로 추정한 장르 집합."""
+    tokens = normalize_query(query).split()
+    genres = set()
+    for genre, keywords in GENRE_KEYWORDS.items():
+        # 한 글자 키워드("시")는 정확히 일치할 때만 ("시간" 등 오탐 방지)
+        if any(
+            token == keyword or (len(keyword) > 1 and token.startswith(keyword))
+            for token in tokens
+            for keyword in keywords
+        ):
+            genres.add(genre)
+    return genres
+
+
+def score_book(book: dict, genres: set[str], query_grams: set[str]) -> float:
+    """장르 일치 + 질의 bigram 겹침 비율 + 순위 가중치."""
+    score = 0.0
+    genre = book.get("genre") or ""
+    if genre and any(g in genre or genre in g for g in genres):
+        score += 3.0
+    if query_grams:
+        text = f"{book['title']} {book['author']} {genre} {book.get('description') or ''}"
+        score += 2.0 * len(query_grams & _bigrams(text)) / len(query_grams)
+    best_rank = min(book["rankings"].values(), default=None)
+    if best_rank:
+        score += 1.0 / best_rank
+    return score
+
+
+def _row(short_id: str, book: dict) -> str:
+    ranks = ",".join(f"{store}{rank}" for store, rank in book["rankings"].items())
+    description = (book.get("description") or "").replace("|", "/").replace("\n", " ")
+    return "|".join([
+        short_id,
+        book["title"].replace("|", "/"),
+        book["author"].replace("|", "/"),
+        book.get("genre") or "종합",
+        str(book["rating"]) if book.get("rating") else "-",
+        ranks or "-",
+        description[:40],
+    ])
+
+
+class PromptContext:
+    """프롬프트에 들어간 후보 표와 짧은 id → 도서 레코드 매핑."""
+
+    __slots__ = ("table", "books", "tokens")
+
+    def __init__(self, table: str, books: dict[str, dict], tokens: int):
+        self.table = table
+        self.books = books
+        self.tokens = tokens
+
+    def expand(self, short_id: str) -> Optional[dict]:
+        return self.books.get(str(short_id).strip())
+
+
+def build_prompt_context(
+    query: str,
+    books: list[dict],
+    max_books: int,
+    token_budget: Optional[int] = None,
+) -> PromptContext:
+    """질의와 관련도가 높은 순으로 후보를 골라 토큰 예산 안에서 표로 인코딩."""
+    token_budget = token_budget or settings.PROMPT_CONTEXT_TOKEN_BUDGET
+    genres = query_genres(query)
+    query_grams = _bigrams(normalize_query(query))
+    ranked = sorted(books, key=lambda b: score_book(b, genres, query_grams), reverse=True)
+
+    lines = [TABLE_HEADER]
+    tokens = estimate_tokens(TABLE_HEADER)
+    selected: dict[str, dict] = {}
+    for book in ranked[: settings.PROMPT_MAX_CANDIDATES]:
+        short_id = f"b{len(selected) + 1}"
+        line = _row(short_id, book)
+        cost = estimate_tokens(line) + 1
+        # 최소 max_books 권은 예산과 관계없이 포함
+        if tokens + cost > token_budget and len(selected) >= max_books:
+            break
+        lines.append(line)
+        tokens += cost
+        selected[short_id] = book
+
+    if not selected:
+        return PromptContext("현재 베스트셀러 데이터가 없습니다. (크롤링 필요)", {}, 0)
+    return PromptContext("\n".join(lines), selected, tokens)
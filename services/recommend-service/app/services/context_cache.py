@@ -0,0 +1,137 @@
+"""
+Context Cache - 추천 요청용 베스트셀러 컨텍스트 인프로세스 캐시
+- 버전 키: 마지막으로 성공한 크롤링(CrawlLog status=done)의 id + finished_at
+- 백그라운드 폴러가 버전 변경을 감지하면 재구성 → 요청 경로는 DB 접근 없음
+- TTL 경과 시 기존 값을 그대로 제공하면서 백그라운드 재구성 (stale-while-revalidate)
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import desc, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.book import CrawlLog
+from app.services.book_service import load_bestseller_books
+
+logger = logging.getLogger(__name__)
+
+
+class BestsellerContext:
+    """한 버전의 베스트셀러 컨텍스트 (도서 레코드 — 프롬프트는 요청마다 build_prompt_context로 구성)."""
+
+    __slots__ = ("version", "books", "loaded_at")
+
+    def __init__(self, version: str, books: list[dict]):
+        self.version = version
+        self.books = books
+        self.loaded_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+
+class ContextCache:
+    """버전 키 + TTL 기반 컨텍스트 캐시. 재구성은 한 번에 하나만 실행."""
+
+    def __init__(self, ttl_seconds: float, poll_interval_seconds: float, limit: int):
+        self.ttl_seconds = ttl_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.limit = limit
+
+        self._current: Optional[BestsellerContext] = None
+        self._lock = asyncio.Lock()
+        self._poller: Optional[asyncio.Task] = None
+        self._revalidating: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _latest_version(db) -> str:
+        result = await db.execute(
+            select(CrawlLog.id, CrawlLog.finished_at)
+            .where(CrawlLog.status == "done", CrawlLog.finished_at.is_not(None))
+            .order_by(desc(CrawlLog.finished_at), desc(CrawlLog.id))
+            .limit(1)
+        )
+        row = result.first()
+        return f"{row.id}:{row.finished_at.isoformat()}" if row else "empty"
+
+    async def refresh(self, force: bool = False) -> BestsellerContext:
+        """버전이 바뀌었거나 TTL이 지났으면(또는 force) DB에서 재구성."""
+        async with self._lock:
+            current = self._current
+            async with AsyncSessionLocal() as db:
+                version = await self._latest_version(db)
+                if (
+                    not force
+                    and current is not None
+                    and current.version == version
+                    and current.age < self.ttl_seconds
+                ):
+                    return current
+                books = await load_bestseller_books(db, limit=self.limit)
+
+            self._current = BestsellerContext(version=version, books=books)
+            if current is None or current.version != version:
+                logger.info(f"📚 Bestseller context loaded: version={version} books={len(books)}")
+            return self._current
+
+    async def get(self) -> BestsellerContext:
+        """캐시된 컨텍스트 반환. 비어 있을 때만 요청 경로에서 DB를 읽음."""
+        current = self._current
+        if current is None:
+            return await self.refresh()
+        if current.age >= self.ttl_seconds and self._revalidating is None:
+            self._revalidating = asyncio.create_task(self._revalidate())
+        return current
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"⚠️ Bestseller context refresh failed: {e}")
+
+    async def _revalidate(self) -> None:
+        try:
+            await self._refresh_quietly()
+        finally:
+            self._revalidating = None
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            await self._refresh_quietly()
+
+    async def start(self) -> None:
+        """컨텍스트 선적재 후 버전 폴러 시작 (lifespan에서 호출)."""
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"⚠️ Bestseller context preload failed: {e}")
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        for task in (self._poller, self._revalidating):
+            if task is not None:
+                task.cancel()
+        self._poller = None
+
+    def stats(self) -> dict:
+        current = self._current
+        return {
+            "version": current.version if current else None,
+            "books": len(current.books) if current else 0,
+            "age_seconds": round(current.age, 1) if current else None,
+            "ttl_seconds": self.ttl_seconds,
+            "poll_interval_seconds": self.poll_interval_seconds,
+        }
+
+
+context_cache = ContextCache(
+    ttl_seconds=settings.CONTEXT_CACHE_TTL_SECONDS,
+    poll_interval_seconds=settings.CONTEXT_POLL_INTERVAL_SECONDS,
+    limit=settings.BESTSELLER_CONTEXT_LIMIT,
+)
@@ -3,126 +3,236 @@ LLM Service - Google Gemini API 연동
 GOOGLE_MODEL_NAME 환경변수로 모델명 동적 지정
 JSON 스트리밍 응답 생성
 """
+import hashlib
 import json
 import logging
-from typing import AsyncGenerator, Optional
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
 
+import google.ai.generativelanguage as glm
 import google.generativeai as genai
-from google.generativeai.types import GenerationConfig
+from google.api_core.client_options import ClientOptions
+from google.api_core.gapic_v1.client_info import ClientInfo
 
 from app.core.config import settings
+from app.services.context_builder import PromptContext
+from app.services.stream_parser import RecommendationStreamParser
 
 logger = logging.getLogger(__name__)
 
 
-def _get_client(api_key: Optional[str] = None) -> genai.GenerativeModel:
-    """Gemini 클라이언트 생성 (제공된 키 또는 환경변수 기반)."""
+class _ClientEntry:
+    """레지스트리 항목 — 전용 async 클라이언트(gRPC 채널) + 사용 중인 스트림 수."""
+
+    __slots__ = ("client", "leases", "evicted")
+
+    def __init__(self, client: glm.GenerativeServiceAsyncClient):
+        self.client = client
+        self.leases = 0
+        self.evicted = False
+
+
+class _ClientRegistry:
+    """
+    (API 키 해시, 모델명)별 GenerativeServiceAsyncClient 재사용 레지스트리.
+    genai.configure()의 전역 상태를 쓰지 않고 키마다 전용 클라이언트(gRPC 채널)를 둠 —
+    서로 다른 키를 쓰는 동시 요청이 자격 증명을 덮어쓰지 않음.
+    LRU로 축출된 클라이언트는 진행 중인 스트림이 모두 끝나면 transport를 닫음.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[tuple[str, str], _ClientEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build(api_key: str) -> glm.GenerativeServiceAsyncClient:
+        return glm.GenerativeServiceAsyncClient(
+            client_options=ClientOptions(api_key=api_key),
+            client_info=ClientInfo(user_agent=f"genai-py/{genai.__version__}"),
+        )
+
+    @asynccontextmanager
+    async def lease(self, api_key: str, model_name: str) -> AsyncIterator[glm.GenerativeServiceAsyncClient]:
+        """클라이언트를 빌려 쓰는 동안 축출되어도 채널을 닫지 않음."""
+        key = (hashlib.sha256(api_key.encode()).hexdigest(), model_name)
+        evicted: list[_ClientEntry] = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            else:
+                entry = _ClientEntry(self._build(api_key))
+                self._entries[key] = entry
+                while len(self._entries) > self.max_size:
+                    _, old = self._entries.popitem(last=False)
+                    old.evicted = True
+                    if old.leases == 0:
+                        evicted.append(old)
+            entry.leases += 1
+        for old in evicted:
+            await self._close(old)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                idle = entry.evicted and entry.leases == 0
+            if idle:
+                await self._close(entry)
+
+    @staticmethod
+    async def _close(entry: _ClientEntry) -> None:
+        try:
+            await entry.client.transport.close()
+        except Exception as e:
+            logger.warning(f"Gemini 클라이언트 종료 실패: {e}")
+
+    async def close(self) -> None:
+        """종료 시 모든 클라이언트 transport 닫기."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            await self._close(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_registry = _ClientRegistry(max_size=settings.LLM_CLIENT_CACHE_SIZE)
+
+
+def _client_lease(api_key: Optional[str] = None):
+    """Gemini 클라이언트 대여 (제공된 키 또는 환경변수 기반, 키/모델별로 재사용)."""
     target_key = api_key or settings.GOOGLE_API_KEY
     if not target_key:
         raise ValueError("Google API Key가 설정되지 않았습니다.")
-        
-    genai.configure(api_key=target_key)
-    return genai.GenerativeModel(
-        model_name=settings.GOOGLE_MODEL_NAME,
-        generation_config=GenerationConfig(
+    return _registry.lease(target_key, settings.GOOGLE_MODEL_NAME)
+
+
+async def close_clients() -> None:
+    await _registry.close()
+
+
+def _build_request(prompt: str) -> glm.GenerateContentRequest:
+    model_name = settings.GOOGLE_MODEL_NAME
+    return glm.GenerateContentRequest(
+        model=model_name if model_name.startswith("models/") else f"models/{model_name}",
+        contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+        generation_config=glm.GenerationConfig(
             temperature=0.7,
             max_output_tokens=2048,
         ),
     )
 
 
-def _build_prompt(query: str, books_context: str, max_books: int) -> str:
-    return f"""당신은 한국 도서 추천 전문 큐레이터입니다.
-사용자 요청: "{query}"
+def _response_text(response: glm.GenerateContentResponse) -> str:
+    """스트림 응답 청크의 첫 후보 텍스트 (후보가 없으면 빈 문자열)."""
+    if not response.candidates:
+        return ""
+    return "".join(part.text for part in response.candidates[0].content.parts)
+
 
-현재 서점 베스트셀러 데이터:
-{books_context}
+def _build_prompt(query: str, books_table: str, max_books: int) -> str:
+    return f"""한국 도서 추천 큐레이터로서 아래 베스트셀러 후보 중 요청에 맞는 도서 {max_books}권 이하를 고르세요.
+요청: "{query}"
 
-지시사항:
-1. 사용자 요청에 가장 적합한 도서 {max_books}권을 선정하세요.
-2. 먼저 자연스러운 한국어로 1~2 문단의 추천 이유를 작성하세요.
-3. 그 다음 아래 JSON 형식으로 도서 목록을 출력하세요:
+후보 (id|제목|저자|장르|평점|순위|소개):
+{books_table}
 
+출력 형식:
+1. 자연스러운 한국어 1~2 문단으로 추천 이유
+2. 고른 도서의 id만 추천 순서대로:
 ### BOOKS_JSON ###
-[
-  {{
-    "id": "1",
-    "title": "도서제목",
-    "author": "저자명",
-    "genre": "장르",
-    "rating": 4.5,
-    "description": "간단한 설명 (50자 이내)",
-    "cover_color": "#HEX색상코드",
-    "rankings": {{"kyobo": 1, "aladdin": 2}}
-  }}
-]
+[{{"id": "b1"}}, {{"id": "b2"}}]
 ### END_JSON ###
 
-### SOURCES_JSON ###
-[
-  {{"store": "kyobo", "category": "종합 베스트셀러", "confidence": 95}},
-  {{"store": "aladdin", "category": "주간 베스트", "confidence": 88}}
-]
-### END_SOURCES ###
+후보에 없는 도서는 고르지 말고, 마크다운 코드블록은 사용하지 마세요."""
+
+
+def _derive_sources(books: list[dict]) -> list[dict]:
+    """추천 도서들의 서점별 랭킹 분포로 출처(서점/카테고리/신뢰도) 계산."""
+    counts: dict[str, int] = {}
+    categories: dict[str, str] = {}
+    for book in books:
+        for store in book["rankings"]:
+            counts[store] = counts.get(store, 0) + 1
+            categories.setdefault(store, (book.get("categories") or {}).get(store) or "베스트셀러")
+    return [
+        {"store": store, "category": categories[store], "confidence": round(100 * count / len(books))}
+        for store, count in sorted(counts.items(), key=lambda item: -item[1])
+    ]
+
 
-JSON 형식을 정확히 유지하세요. 마크다운 코드블록은 사용하지 마세요."""
+def _chunk(event_type: str, data) -> str:
+    """StreamChunk JSON line 한 줄."""
+    return json.dumps({"type": event_type, "data": data}, ensure_ascii=False) + "\n"
 
 
 async def stream_recommendation(
     query: str,
-    books_context: str,
+    prompt_context: PromptContext,
     max_books: int = 6,
     api_key: Optional[str] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Gemini API 스트리밍으로 추천 텍스트+JSON 청크 생성.
-    StreamChunk JSON line을 yield.
+    LLM이 고른 짧은 id를 prompt_context의 도서 레코드로 확장해 StreamChunk JSON line을 yield.
     """
-    model = _get_client(api_key=api_key)
-    prompt = _build_prompt(query, books_context, max_books)
+    prompt = _build_prompt(query, prompt_context.table, max_books)
 
     try:
-        response = await model.generate_content_async(
-            prompt,
-            stream=True,
-        )
-
-        full_text = ""
-        books_sent = False
-        sources_sent = False
-
-        async for chunk in response:
-            if not chunk.text:
-                continue
-
-            full_text += chunk.text
-
-            # 텍스트 파트를 실시간 스트리밍 (JSON 구분자 이전까지)
-            if "### BOOKS_JSON ###" not in full_text:
-                text_part = chunk.text
-                yield json.dumps({"type": "text", "data": text_part}, ensure_ascii=False) + "\n"
-            else:
-                # 텍스트 파트가 있고 books/sources 파싱 가능할 때
-                if not books_sent and "### END_JSON ###" in full_text:
-                    try:
-                        books_raw = full_text.split("### BOOKS_JSON ###")[1].split("### END_JSON ###")[0].strip()
-                        books_data = json.loads(books_raw)
-                        yield json.dumps({"type": "books", "data": books_data}, ensure_ascii=False) + "\n"
-                        books_sent = True
-                    except (json.JSONDecodeError, IndexError) as e:
-                        logger.warning(f"books JSON 파싱 실패: {e}")
-
-                if not sources_sent and "### END_SOURCES ###" in full_text:
-                    try:
-                        sources_raw = full_text.split("### SOURCES_JSON ###")[1].split("### END_SOURCES ###")[0].strip()
-                        sources_data = json.loads(sources_raw)
-                        yield json.dumps({"type": "sources", "data": sources_data}, ensure_ascii=False) + "\n"
-                        sources_sent = True
-                    except (json.JSONDecodeError, IndexError) as e:
-                        logger.warning(f"sources JSON 파싱 실패: {e}")
-
-        yield json.dumps({"type": "done", "data": None}) + "\n"
+        # 새 청크만 스캔하는 증분 파서 — text / book(객체 단위) / books 이벤트
+        parser = RecommendationStreamParser()
+        selected: dict[str, dict] = {}
+
+        def expand(item) -> Optional[dict]:
+            short_id = item.get("id") if isinstance(item, dict) else item
+            book = prompt_context.expand(short_id)
+            if book is None:
+                logger.warning(f"후보에 없는 도서 id: {short_id}")
+            return book
+
+        def to_chunks(events) -> list[str]:
+            chunks = []
+            for event_type, data in events:
+                if event_type == "book":
+                    book = expand(data)
+                    if book is None or book["id"] in selected or len(selected) >= max_books:
+                        continue
+                    selected[book["id"]] = book
+                    chunks.append(_chunk("book", book))
+                elif event_type == "books":
+                    # 스트리밍 중 놓친 항목이 있으면 최종 목록에서 보완
+                    for item in data if isinstance(data, list) else []:
+                        short_id = item.get("id") if isinstance(item, dict) else item
+                        book = prompt_context.expand(short_id)
+                        if book is not None and len(selected) < max_books:
+                            selected.setdefault(book["id"], book)
+                    books = list(selected.values())
+                    chunks.append(_chunk("books", books))
+                    if books:
+                        chunks.append(_chunk("sources", _derive_sources(books)))
+                elif event_type == "text":
+                    chunks.append(_chunk("text", data))
+            return chunks
+
+        async with _client_lease(api_key=api_key) as client:
+            response = await client.stream_generate_content(request=_build_request(prompt))
+            async for chunk in response:
+                text = _response_text(chunk)
+                if not text:
+                    continue
+                for line in to_chunks(parser.feed(text)):
+                    yield line
+
+        for line in to_chunks(parser.finish()):
+            yield line
+        yield _chunk("done", None)
 
     except Exception as e:
         logger.error(f"LLM 스트리밍 오류: {e}")
-        yield json.dumps({"type": "error", "data": str(e)}, ensure_ascii=False) + "\n"
+        yield _chunk("error", str(e))
@@ -0,0 +1,229 @@
+"""
+Recommendation Cache - LLM 추천 스트림(NDJSON) 응답 캐시
+- 키: 정규화된 질의 + max_books + 모델명 + 베스트셀러 컨텍스트 버전
+- 정확히 일치하지 않으면 같은 (max_books, 모델, 버전) 안에서 문자 n-gram 코사인 유사도로 근사 일치 조회
+  (기본 꺼짐 — 켜더라도 부정 표현(말고/빼고/제외)과 숫자가 똑같은 질의끼리만 근사 일치)
+- 적중 시 저장된 청크(text/books/sources/done)를 스트리밍 속도로 재생
+- done으로 정상 종료된 스트림만 저장, LRU + 전체 바이트 상한 + TTL 축출
+"""
+import asyncio
+import json
+import math
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from contextlib import aclosing
+from typing import AsyncGenerator, AsyncIterator, Optional
+
+from app.core.config import settings
+
+# 의미에 영향이 적은 요청 표현 — 유사도 비교 전에 제거
+_FILLER_WORDS = {"추천", "추천좀", "좀", "부탁해", "부탁해요", "부탁드려요", "알려줘", "알려주세요", "해줘", "해주세요"}
+_FILLER_SUFFIXES = ("해주세요", "해줘요", "해줘", "해봐", "좀")
+# 의미를 뒤집는 표현 — n-gram이 거의 같아도 이 토큰이 다르면 다른 질의
+_NEGATION_MARKERS = ("말고", "빼고", "제외")
+# 재생 시 저장하지 않는 이벤트 (요청마다 달라지는 진행 상태)
+_TRANSIENT_TYPES = {"queued"}
+
+
+def normalize_query(query: str) -> str:
+    """NFKC + 소문자 + 기호 제거 + 요청 표현 제거 후 공백 하나로 연결."""
+    text = unicodedata.normalize("NFKC", query).lower()
+    tokens = []
+    for token in re.findall(r"\w+", text):
+        for suffix in _FILLER_SUFFIXES:
+            if token.endswith(suffix) and len(token) > len(suffix):
+                token = token[: -len(suffix)]
+                break
+        if token not in _FILLER_WORDS:
+            tokens.append(token)
+    return " ".join(tokens)
+
+
+def query_vector(normalized: str) -> tuple[Counter, float]:
+    """공백을 제외한 문자 2/3-gram 빈도 벡터와 norm (로컬 임베딩 대용)."""
+    compact = normalized.replace(" ", "")
+    grams = Counter(compact[i:i + n] for n in (2, 3) for i in range(len(compact) - n + 1))
+    if not grams and compact:
+        grams[compact] = 1
+    return grams, math.sqrt(sum(v * v for v in grams.values()))
+
+
+def query_guard(normalized: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """근사 일치 전제 조건: (부정 표현이 든 토큰들, 숫자 토큰들) — 양쪽이 같아야 SIMILAR."""
+    tokens = normalized.split()
+    negations = tuple(t for t in tokens if any(marker in t for marker in _NEGATION_MARKERS))
+    numbers = tuple(re.findall(r"\d+", normalized))
+    return negations, numbers
+
+
+def cosine(a: tuple[Counter, float], b: tuple[Counter, float]) -> float:
+    (va, na), (vb, nb) = a, b
+    if not na or not nb:
+        return 0.0
+    if len(va) > len(vb):
+        va, vb = vb, va
+    return sum(count * vb.get(gram, 0) for gram, count in va.items()) / (na * nb)
+
+
+class RecommendationKey:
+    """캐시 조회 키 — exact: 완전 일치 키, bucket: 유사도 조회 범위."""
+
+    __slots__ = ("exact", "bucket", "vector", "guard")
+
+    def __init__(self, query: str, max_books: int, model: str, context_version: str):
+        normalized = normalize_query(query)
+        self.bucket = f"{model}|{max_books}|{context_version}"
+        self.exact = f"{self.bucket}|{normalized}"
+        self.vector = query_vector(normalized)
+        self.guard = query_guard(normalized)
+
+
+class CachedRecommendation:
+    __slots__ = ("key", "chunks", "size", "stored_at", "hits")
+
+    def __init__(self, key: RecommendationKey, chunks: list[tuple[str, str]]):
+        self.key = key
+        self.chunks = chunks   # (type, NDJSON line)
+        self.size = sum(len(line.encode()) for _, line in chunks)
+        self.stored_at = time.monotonic()
+        self.hits = 0
+
+
+class RecommendationCache:
+    """추천 스트림 LRU 캐시 (정확 일치 + 근사 일치)."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+        similarity_threshold: float,
+        replay_delay_ms: float,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.similarity_threshold = similarity_threshold
+        self.replay_delay_ms = replay_delay_ms
+
+        self._entries: "OrderedDict[str, CachedRecommendation]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def make_key(self, query: str, max_books: int, model: str, context_version: str) -> RecommendationKey:
+        return RecommendationKey(query, max_books, model, context_version)
+
+    def _expired(self, entry: CachedRecommendation) -> bool:
+        return time.monotonic() - entry.stored_at >= self.ttl_seconds
+
+    def _remove(self, exact: str) -> None:
+        entry = self._entries.pop(exact, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def lookup(self, key: RecommendationKey) -> tuple[Optional[CachedRecommendation], str]:
+        """반환: (항목 | None, "HIT" | "SIMILAR" | "MISS")."""
+        entry = self._entries.get(key.exact)
+        if entry is not None and self._expired(entry):
+            self._remove(key.exact)
+            entry = None
+        if entry is not None:
+            self.hits += 1
+            status = "HIT"
+        else:
+            entry = self._most_similar(key)
+            if entry is None:
+                self.misses += 1
+                return None, "MISS"
+            self.similar_hits += 1
+            status = "SIMILAR"
+        entry.hits += 1
+        self._entries.move_to_end(entry.key.exact)
+        return entry, status
+
+    def _most_similar(self, key: RecommendationKey) -> Optional[CachedRecommendation]:
+        if self.similarity_threshold <= 0:
+            return None
+        best, best_score = None, self.similarity_threshold
+        for entry in list(self._entries.values()):
+            if entry.key.bucket != key.bucket or entry.key.guard != key.guard:
+                continue
+            if self._expired(entry):
+                self._remove(entry.key.exact)
+                continue
+            score = cosine(key.vector, entry.key.vector)
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    def store(self, key: RecommendationKey, chunks: list[tuple[str, str]]) -> bool:
+        entry = CachedRecommendation(key, chunks)
+        if entry.size > self.max_bytes:
+            return False
+        self._remove(key.exact)
+        self._entries[key.exact] = entry
+        self._bytes += entry.size
+        self.stores += 1
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+
+    async def record(self, key: RecommendationKey, stream: AsyncIterator[str]) -> AsyncGenerator[str, None]:
+        """
+        스트림을 그대로 전달하면서 청크를 모아, done으로 끝난 경우에만 저장.
+        error로 일찍 끝나도 업스트림을 즉시 닫아 대기열 슬롯 / 클라이언트 대여를 바로 반납.
+        """
+        chunks: list[tuple[str, str]] = []
+        completed = False
+        async with aclosing(stream):
+            async for chunk in stream:
+                yield chunk
+                chunk_type = json.loads(chunk).get("type")
+                if chunk_type in _TRANSIENT_TYPES:
+                    continue
+                chunks.append((chunk_type, chunk))
+                if chunk_type == "error":
+                    return
+                completed = chunk_type == "done"
+        if completed:
+            self.store(key, chunks)
+
+    async def replay(self, entry: CachedRecommendation) -> AsyncGenerator[str, None]:
+        """저장된 청크 재생. text 청크 사이에 replay_delay_ms 간격을 두어 스트리밍 UX 유지."""
+        delay = self.replay_delay_ms / 1000
+        for chunk_type, chunk in entry.chunks:
+            yield chunk
+            if delay and chunk_type == "text":
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.similar_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+recommendation_cache = RecommendationCache(
+    ttl_seconds=settings.RECOMMEND_CACHE_TTL_SECONDS,
+    max_entries=settings.RECOMMEND_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RECOMMEND_CACHE_MAX_BYTES,
+    similarity_threshold=settings.RECOMMEND_CACHE_SIMILARITY,
+    replay_delay_ms=settings.RECOMMEND_CACHE_REPLAY_DELAY_MS,
+)
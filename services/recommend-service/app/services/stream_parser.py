@@ -0,0 +1,196 @@
+"""
+Stream Parser - LLM 추천 응답의 증분 파서
+- 새로 도착한 텍스트만 스캔하는 상태 기계 (TEXT → BOOKS → AFTER_BOOKS → SOURCES → DONE)
+- 청크 경계에 걸친 구분자는 구분자 접두로 일치하는 꼬리만 보류했다가 다음 청크와 합쳐 판별
+- BOOKS_JSON 배열은 스트리밍 디코더로 읽어 원소가 닫히는 즉시 book 이벤트 발행
+  (객체는 닫는 중괄호, 문자열 / 숫자 같은 스칼라 원소는 뒤따르는 쉼표 또는 배열 끝에서)
+- END_JSON 시점에 전체 books, END_SOURCES 시점에 sources 이벤트 발행 (기존 이벤트 호환)
+"""
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+BOOKS_START = "### BOOKS_JSON ###"
+BOOKS_END = "### END_JSON ###"
+SOURCES_START = "### SOURCES_JSON ###"
+SOURCES_END = "### END_SOURCES ###"
+
+TEXT, BOOKS, AFTER_BOOKS, SOURCES, DONE = range(5)
+
+# 상태별로 기다리는 다음 구분자
+_NEXT_MARKER = {
+    TEXT: BOOKS_START,
+    BOOKS: BOOKS_END,
+    AFTER_BOOKS: SOURCES_START,
+    SOURCES: SOURCES_END,
+}
+
+Event = tuple[str, Any]
+
+
+def _partial_marker_length(text: str, marker: str) -> int:
+    """text 끝부분 중 marker의 (진)접두사와 일치하는 최대 길이."""
+    for n in range(min(len(marker) - 1, len(text)), 0, -1):
+        if text.endswith(marker[:n]):
+            return n
+    return 0
+
+
+class JsonArrayStream:
+    """
+    최상위 JSON 배열을 조각 단위로 받아 원소가 닫힐 때마다 반환하는 디코더.
+    원소는 객체 / 배열뿐 아니라 스칼라(["b1", "b3"])도 허용.
+    문자열 / 이스케이프 / 중첩 깊이만 추적하므로 입력 길이에 선형.
+    """
+
+    def __init__(self):
+        self.items: list[Any] = []
+        self.started = False
+        self.closed = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._scalar = False    # 깊이 1의 스칼라 원소를 읽는 중
+        self._item: list[str] = []
+
+    def _complete(self, completed: list[Any]) -> None:
+        raw, self._item = "".join(self._item), []
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"book JSON 파싱 실패: {e}")
+            return
+        self.items.append(item)
+        completed.append(item)
+
+    def feed(self, text: str) -> list[Any]:
+        completed = []
+        for ch in text:
+            if self.closed:
+                break
+            if not self.started:
+                if ch == "[":
+                    self.started = True
+                    self._depth = 1
+                continue
+
+            if self._scalar and not self._in_string and (ch in ",]" or ch.isspace()):
+                # 스칼라 원소 종료 — 구분자 자체는 아래에서 그대로 처리
+                self._scalar = False
+                self._complete(completed)
+
+            if self._depth >= 2 or self._scalar:
+                self._item.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._depth == 1 and not self._scalar:
+                    self._scalar = True
+                    self._item = [ch]
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 1:
+                    self._item = [ch]
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._item:
+                    self._complete(completed)
+                elif self._depth == 0:
+                    self.closed = True
+            elif self._depth == 1 and not self._scalar and ch != "," and not ch.isspace():
+                # 숫자 / true / false / null
+                self._scalar = True
+                self._item = [ch]
+        return completed
+
+
+class RecommendationStreamParser:
+    """feed(텍스트 조각) / finish()가 (type, data) 이벤트 목록을 반환."""
+
+    def __init__(self):
+        self.state = TEXT
+        self._pending = ""
+        self._books = JsonArrayStream()
+        self._books_raw: list[str] = []
+        self._sources_raw: list[str] = []
+
+    def feed(self, text: str) -> list[Event]:
+        self._pending += text
+        events: list[Event] = []
+        while self.state != DONE:
+            marker = _NEXT_MARKER[self.state]
+            idx = self._pending.find(marker)
+            if idx == -1:
+                keep = _partial_marker_length(self._pending, marker)
+                ready = self._pending[: len(self._pending) - keep]
+                self._pending = self._pending[len(ready):]
+                events += self._consume(ready)
+                break
+            events += self._consume(self._pending[:idx])
+            self._pending = self._pending[idx + len(marker):]
+            events += self._close_section()
+        if self.state == DONE:
+            self._pending = ""
+        return events
+
+    def finish(self) -> list[Event]:
+        """
+        스트림 종료 — 보류 중인 텍스트를 내보냄.
+        END_JSON 없이 끝나면(중단 / 잘림) 지금까지 읽은 원소로 books 이벤트를 발행해
+        최종 목록 / sources가 빠진 응답이 나가지 않도록 함.
+        """
+        events = self._consume(self._pending)
+        self._pending = ""
+        if self.state == BOOKS:
+            logger.warning("books JSON 구간이 닫히지 않은 채 스트림 종료 — 읽은 항목까지로 books 발행")
+            events.append(("books", list(self._books.items)))
+            self.state = AFTER_BOOKS
+        return events
+
+    def _consume(self, text: str) -> list[Event]:
+        if not text:
+            return []
+        if self.state == TEXT:
+            return [("text", text)]
+        if self.state == BOOKS:
+            self._books_raw.append(text)
+            return [("book", item) for item in self._books.feed(text)]
+        if self.state == SOURCES:
+            self._sources_raw.append(text)
+        return []
+
+    def _close_section(self) -> list[Event]:
+        events: list[Event] = []
+        if self.state == TEXT:
+            self.state = BOOKS
+        elif self.state == BOOKS:
+            items = self._books.items
+            if not self._books.closed:
+                # 스트리밍 디코더가 배열 끝을 못 본 경우 구간 전체로 재시도
+                try:
+                    items = json.loads("".join(self._books_raw).strip())
+                    events += [("book", item) for item in items[len(self._books.items):]]
+                except (json.JSONDecodeError, TypeError) as e:
+                    logger.warning(f"books JSON 파싱 실패: {e}")
+                    items = None
+            if items is not None:
+                events.append(("books", items))
+            self.state = AFTER_BOOKS
+        elif self.state == AFTER_BOOKS:
+            self.state = SOURCES
+        elif self.state == SOURCES:
+            try:
+                events.append(("sources", json.loads("".join(self._sources_raw).strip())))
+            except json.JSONDecodeError as e:
+                logger.warning(f"sources JSON 파싱 실패: {e}")
+            self.state = DONE
+        return events
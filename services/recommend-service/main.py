@@ -1,6 +1,10 @@
 from fastapi import FastAPI
 from app.routers import health_router, recommend_router
 from app.core.database import init_db
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
+from app.services import llm_service
+from app.services.coalescer import coalescer
+from app.services.context_cache import context_cache
 from contextlib import asynccontextmanager
 import logging
 
@@ -11,10 +15,16 @@ logger = logging.getLogger("recommend-service")
 async def lifespan(app: FastAPI):
     logger.info("🚀 Recommend Service Starting")
     await init_db()
+    await context_cache.start()
     yield
+    await context_cache.stop()
+    await coalescer.stop()
+    await llm_service.close_clients()
     logger.info("🛑 Recommend Service Shutting Down")
 
 app = FastAPI(title="Recommend Service", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, service="recommend-service")
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 app.include_router(health_router)
 app.include_router(recommend_router)